@@ -1,12 +1,55 @@
+import atexit
+import copy
 import json
+import select
 import subprocess
+from functools import lru_cache
 import sys
+import time
 from typing import Dict, List, Optional
 import os
 
+try:
+    import simdjson
+except ImportError:  # pysimdjson is optional; fall back to orjson or the stdlib parser
+    simdjson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 DEFAULT_CONFIG_PATH = "/Library/Application Support/Claude/claude_desktop_config.json"
 
+# Seconds to wait for the filesystem server to answer a command
+REPLY_TIMEOUT = 30.0
+
+# A single simdjson parser is reused across loads to avoid reallocating its buffers.
+_PARSER = simdjson.Parser() if simdjson is not None else None
+
+
+def _loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _parse_json(f) -> Dict:
+    """Parse a JSON file opened in binary mode, preferring simdjson, then orjson."""
+    data = f.read()
+    if _PARSER is not None:
+        # Materialize to a dict: the reused parser invalidates lazy objects on its next parse.
+        return _PARSER.parse(data).as_dict()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@lru_cache(maxsize=8)
+def _parse_config(config_path: str, mtime_ns: int, size: int) -> Dict:
+    """Parse a config file, memoized on its mtime and size so unchanged files are read once."""
+    with open(config_path, 'rb') as f:
+        return _parse_json(f)
+
 
 class MCPClient:
     def __init__(self, config_path: str = None):
@@ -16,16 +59,38 @@ class MCPClient:
             config_path = home + os.getenv('MCP_CONFIG_PATH', DEFAULT_CONFIG_PATH)
         self.config = self._load_config(config_path)
         self.filesystem_server = self._get_filesystem_server()
+        self._proc: Optional[subprocess.Popen] = None
+        self._buf = b""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self, kill: bool = False):
+        """Terminate (or with kill=True, kill) the filesystem server process if it is running."""
+        if self._proc is not None:
+            atexit.unregister(self.close)
+            if self._proc.poll() is None:
+                if kill:
+                    self._proc.kill()
+                else:
+                    self._proc.terminate()
+                self._proc.wait()
+            self._proc = None
+        self._buf = b""
 
     def _load_config(self, config_path: str) -> Dict:
         """Load the MCP configuration from the specified JSON file."""
         try:
-            with open(config_path, 'r') as f:
-                return json.load(f)
+            st = os.stat(config_path)
+            # Each client gets its own copy so mutating it can't leak into the cache
+            return copy.deepcopy(_parse_config(config_path, st.st_mtime_ns, st.st_size))
         except FileNotFoundError:
             print(f"Error: Configuration file not found at {config_path}")
             sys.exit(1)
-        except json.JSONDecodeError:
+        except ValueError:  # covers json, orjson and simdjson decode errors
             print(f"Error: Invalid JSON in configuration file {config_path}")
             sys.exit(1)
 
@@ -36,27 +101,91 @@ class MCPClient:
             sys.exit(1)
         return self.config['mcpServers']['filesystem']
 
-    def run_filesystem_command(self, command: str) -> Optional[str]:
-        """Run a command through the filesystem server."""
-        try:
+    def _get_process(self) -> subprocess.Popen:
+        """Start the filesystem server on first use and keep it running."""
+        if self._proc is None or self._proc.poll() is not None:
             # Construct the full command with Docker arguments
             docker_args = self.filesystem_server['args']
             full_command = [self.filesystem_server['command']] + docker_args
 
-            # Run the command and capture output
-            result = subprocess.run(
+            # Server stderr is inherited so it can't fill an unread pipe
+            self._proc = subprocess.Popen(
                 full_command,
-                input=command.encode(),
-                capture_output=True,
-                text=True
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                bufsize=0,
             )
+            atexit.register(self.close)
+        return self._proc
+
+    def _read_line(self, proc: subprocess.Popen, deadline: float) -> bytes:
+        """Read one newline-terminated message from the server before `deadline`.
+
+        Raises TimeoutError if the server stays silent and EOFError if it exits.
+        """
+        while b"\n" not in self._buf:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("filesystem server did not reply in time")
+            ready, _, _ = select.select([proc.stdout], [], [], remaining)
+            if not ready:
+                continue
+            chunk = os.read(proc.stdout.fileno(), 65536)
+            if not chunk:
+                raise EOFError
+            self._buf += chunk
+        line, _, self._buf = self._buf.partition(b"\n")
+        return line
+
+    def run_filesystem_command(self, command: str, timeout: float = REPLY_TIMEOUT) -> Optional[str]:
+        """Run a command through the filesystem server.
+
+        The server process is started once and reused. Messages in both
+        directions are newline-delimited JSON-RPC, as in the MCP stdio
+        transport. When the command carries an id, messages are read until
+        the response with that id arrives; notifications in between are
+        skipped. A reply that isn't JSON, or no reply within `timeout`
+        seconds, leaves the stream out of sync, so the server is killed and
+        respawned on the next command.
+        """
+        try:
+            request = _loads(command)
+            request_id = request.get("id") if isinstance(request, dict) else None
+        except ValueError:
+            request_id = None
+
+        try:
+            proc = self._get_process()
+            proc.stdin.write(command.encode() + b"\n")
+            proc.stdin.flush()
 
-            if result.returncode != 0:
-                print(f"Error: Command failed with return code {result.returncode}")
-                print(f"Error output: {result.stderr}")
-                return None
+            deadline = time.monotonic() + timeout
+            while True:
+                line = self._read_line(proc, deadline)
+                if not line.strip():
+                    continue
+                try:
+                    message = _loads(line)
+                except ValueError:
+                    print("Error: filesystem server sent a malformed reply; restarting it")
+                    self.close(kill=True)
+                    return None
+                if request_id is None or (
+                    isinstance(message, dict)
+                    and message.get("id") == request_id
+                    and ("result" in message or "error" in message)
+                ):
+                    return line.decode().strip()
 
-            return result.stdout.strip()
+        except TimeoutError as e:
+            print(f"Error: {e}; restarting it")
+            self.close(kill=True)
+            return None
+
+        except EOFError:
+            print(f"Error: Command failed with return code {proc.wait()}")
+            self.close()
+            return None
 
         except Exception as e:
             print(f"Error running command: {str(e)}")
@@ -64,10 +193,9 @@ class MCPClient:
 
 def main():
     # Example usage
-    client = MCPClient()
-    
-    # Example command to list files
-    result = client.run_filesystem_command("ls")
+    with MCPClient() as client:
+        # Example command to list files
+        result = client.run_filesystem_command("ls")
     if result:
         print("Files in directory:")
         print(result)
@@ -1,10 +1,21 @@
+import asyncio
+from collections import OrderedDict
+import copy
 from functools import cache
+import atexit
+import hashlib
+import logging
 import os
-from typing import Any, List, Dict, Optional, Union
+import threading
+import time
+from typing import Any, Callable, List, Dict, Optional, Tuple, Union
 import pinecone
 from pinecone import Index
 from mcp.server.fastmcp import FastMCP
-from ags.lib.embeddings import generate_oai_embeddings
+from ags.lib.embeddings import generate_oai_embedding, generate_oai_embeddings
+
+# Logged to stderr: stdout carries the MCP stdio transport
+logger = logging.getLogger(__name__)
 
 # Initialize FastMCP server
 mcp = FastMCP("pinecone")
@@ -39,6 +50,205 @@ def get_index(index_name: str, dimension: int = 1536) -> Union[Index, str]:
     except Exception as e:
         return f"Error initializing Pinecone: {str(e)}"
 
+class BatchWriteError(Exception):
+    """One or more queued upserts failed after `store_embedding` returned."""
+
+    def __init__(self, failed_ids: List[str], errors: List[Exception]):
+        self.failed_ids = failed_ids
+        self.errors = errors
+        super().__init__(
+            f"{len(failed_ids)} queued embedding(s) failed to write "
+            f"in {len(errors)} batch(es); last error: {errors[-1]!r}"
+        )
+
+
+class UpsertBatcher:
+    """Coalesce vector upserts for one index into batched Pinecone requests.
+
+    Texts are queued by `add` and handled by a background task once
+    `batch_size` are pending or `flush_interval` seconds have passed since the
+    first one arrived: the whole batch is embedded with one OpenAI request and
+    written with one `index.upsert` call.
+
+    Failed batches are logged as they happen and accumulated; they are raised
+    as a BatchWriteError by the next `flush` or `raise_pending` call, and
+    logged again at exit if never reported. `add` never raises them, so a new
+    item isn't rejected over an unrelated earlier batch.
+    """
+
+    def __init__(
+        self,
+        index: Index,
+        namespace: str = "default",
+        batch_size: int = 100,
+        flush_interval: float = 0.25,
+        on_write: Optional[Callable[[], None]] = None,
+    ):
+        self.index = index
+        self.namespace = namespace
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_write = on_write
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._failed_ids: List[str] = []
+        self._errors: List[Exception] = []
+
+    def raise_pending(self) -> None:
+        """Raise (and clear) failures from batches written since the last report.
+
+        Raises:
+            BatchWriteError: If any queued item failed to write
+        """
+        if self._errors:
+            error = BatchWriteError(self._failed_ids, self._errors)
+            self._failed_ids, self._errors = [], []
+            raise error
+
+    async def add(self, item: Tuple[str, str, Dict[str, Any]]) -> None:
+        """Queue an (id, text, metadata) item, starting the background writer on first use."""
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+        await self._queue.put(item)
+
+    async def flush(self) -> None:
+        """Wait until every queued item has been embedded and written.
+
+        Raises:
+            BatchWriteError: If any queued item failed to write
+        """
+        if self._queue is not None:
+            await self._queue.join()
+        self.raise_pending()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                texts = [text for _, text, _ in batch]
+                embeddings = await asyncio.to_thread(generate_oai_embeddings, texts)
+                vectors = [
+                    (id, embedding, metadata)
+                    for (id, _, metadata), embedding in zip(batch, embeddings)
+                ]
+                await asyncio.to_thread(
+                    self.index.upsert, vectors=vectors, namespace=self.namespace
+                )
+                if self.on_write is not None:
+                    self.on_write()
+            except Exception as e:
+                ids = [id for id, _, _ in batch]
+                logger.error(
+                    "Upsert of %d vector(s) to namespace %r failed: %r", len(ids), self.namespace, e
+                )
+                self._failed_ids.extend(ids)
+                self._errors.append(e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+_batchers: Dict[str, UpsertBatcher] = {}
+
+
+@atexit.register
+def _report_unflushed_errors() -> None:
+    for index_name, batcher in _batchers.items():
+        if batcher._errors:
+            logger.error(
+                "%s: %d queued embedding(s) were never written: %s",
+                index_name, len(batcher._failed_ids), ", ".join(batcher._failed_ids),
+            )
+
+
+def get_batcher(index_name: str) -> UpsertBatcher:
+    """Get the upsert batcher for an index, creating it on first use."""
+    batcher = _batchers.get(index_name)
+    if batcher is None:
+        index = get_index(index_name)
+        if isinstance(index, str):  # Error message
+            raise Exception(index)
+        batcher = _batchers[index_name] = UpsertBatcher(
+            index, on_write=lambda: _query_cache.invalidate(index_name)
+        )
+    return batcher
+
+
+class QueryCache:
+    """Thread-safe LRU cache with TTL for query_similar results."""
+
+    def __init__(self, max_size: int = 2000, ttl_seconds: float = 300):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[bytes, Tuple[str, float, List[Dict[str, Any]]]] = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _key(index_name: str, query_text: str, top_k: int) -> bytes:
+        return hashlib.blake2b(
+            f"{index_name}|{top_k}|{query_text}".encode(), digest_size=16
+        ).digest()
+
+    def get(self, index_name: str, query_text: str, top_k: int) -> Optional[List[Dict[str, Any]]]:
+        """Return a copy of the cached results, or None if missing or expired."""
+        key = self._key(index_name, query_text, top_k)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            # Callers may mutate what they get back; keep the cached entry intact
+            return copy.deepcopy(entry[2])
+
+    def put(self, index_name: str, query_text: str, top_k: int, results: List[Dict[str, Any]]) -> None:
+        """Cache results, evicting the least recently used entry if full."""
+        key = self._key(index_name, query_text, top_k)
+        results = copy.deepcopy(results)
+        with self._lock:
+            self._entries[key] = (index_name, time.monotonic() + self.ttl_seconds, results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, index_name: str) -> None:
+        """Drop all cached results for an index."""
+        with self._lock:
+            stale = [k for k, entry in self._entries.items() if entry[0] == index_name]
+            for key in stale:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+            }
+
+
+_query_cache = QueryCache()
+
 @mcp.tool()
 async def store_embedding(
     index_name: str,
@@ -47,6 +257,10 @@ async def store_embedding(
     id: Optional[str] = None
 ) -> None:
     """Store text embedding.
+
+    The text is queued and embedded and upserted in a batch shortly after this
+    returns; call `flush_embeddings` to wait for pending writes and surface
+    any that failed.
     
     Args:
         index_name: Name of the index
@@ -55,25 +269,29 @@ async def store_embedding(
         id: Optional ID for the vector. If not provided, a stable hash of the text will be used.
         
     Raises:
-        Exception: If there is an error storing the embedding
+        Exception: If the index cannot be initialized
     """
-    index = get_index(index_name)
-    if isinstance(index, str):  # Error message
-        raise Exception(index)
-        
-    # Generate embedding
-    embedding = generate_oai_embeddings(text)
+    batcher = get_batcher(index_name)
     
     # Prepare metadata
     if metadata is None:
         metadata = {}
     metadata["text"] = text
     
-    # Upsert to Pinecone
-    index.upsert(
-        vectors=[(id or f"vec_{hash(text)}", embedding, metadata)],
-        namespace="default"
-    )
+    # Queue for batched embedding and upsert to Pinecone
+    vector_id = id or f"vec_{hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()}"
+    await batcher.add((vector_id, text, metadata))
+    _query_cache.invalidate(index_name)
+
+@mcp.tool()
+async def flush_embeddings() -> None:
+    """Wait for all queued embeddings to be written to Pinecone.
+    
+    Raises:
+        BatchWriteError: If a batched upsert failed
+    """
+    for batcher in list(_batchers.values()):
+        await batcher.flush()
 
 @mcp.tool()
 async def query_similar(
@@ -94,12 +312,16 @@ async def query_similar(
     Raises:
         Exception: If there is an error querying Pinecone
     """
+    cached = _query_cache.get(index_name, query_text, top_k)
+    if cached is not None:
+        return cached
+
     index = get_index(index_name)
     if isinstance(index, str):  # Error message
         raise Exception(index)
             
     # Generate embedding for query
-    query_embedding = generate_oai_embeddings(query_text)
+    query_embedding = generate_oai_embedding(query_text)
     
     # Query Pinecone
     results = index.query(
@@ -119,6 +341,7 @@ async def query_similar(
             "metadata": match.metadata
         })
         
+    _query_cache.put(index_name, query_text, top_k, formatted_results)
     return formatted_results
 
 if __name__ == "__main__":
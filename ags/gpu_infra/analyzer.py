@@ -2,11 +2,54 @@
 GPU Infrastructure Analyzer - Compare costs and reliability across providers.
 """
 
+from concurrent.futures import wait
 from dataclasses import dataclass
+from itertools import chain
+from pathlib import Path
 from typing import Optional
+import os
+import pickle
+import time
 
 from .types import GPUType, ProviderInfo, PricingTier
-from .providers import PROVIDERS
+from .providers import PROVIDER_SPECS, get_provider_class
+from .providers.base import run_in_daemon
+
+
+# Bump the file name when the pickled types change layout
+PROVIDER_CACHE_PATH = Path.home() / ".cache" / "gpu-infra" / "providers-v3.pkl"
+PROVIDER_CACHE_TTL = 3600  # seconds
+
+
+def _provider_source_fingerprint() -> tuple:
+    """Fingerprint the modules provider info is built from.
+
+    Provider info comes from in-code constants, so an upgrade or a
+    hand-edited price must invalidate the disk cache straight away.
+    """
+    package_dir = Path(__file__).parent
+    paths = sorted(package_dir.glob("providers/*.py")) + [package_dir / "types.py"]
+    return tuple((p.name, p.stat().st_mtime_ns, p.stat().st_size) for p in paths)
+
+
+_TABLE_HEADER_TEMPLATE = (
+    f"\n{'='*80}\n"
+    "GPU Type: {gpu}\n"
+    f"{'='*80}\n\n"
+    f"{'Provider':<15} {'$/hr':<10} {'Spot $/hr':<12} {'Reliability':<12} {'Score':<10}\n"
+    + "-" * 70
+)
+
+_TABLE_FOOTER_TEMPLATE = (
+    "\n"
+    "Best for Cost:       {best_cost}\n"
+    "Best for Reliability: {best_reliability}\n"
+    "Best Overall:        {best_overall}"
+)
+
+
+def _format_spot(spot_cost: Optional[float]) -> str:
+    return f"${spot_cost:.2f}" if spot_cost else "N/A"
 
 
 @dataclass
@@ -37,22 +80,82 @@ class GPUInfraAnalyzer:
 
     def __init__(self):
         self._providers: dict[str, ProviderInfo] = {}
+        # gpu_type -> [(provider_name, info, tier)], first matching tier per provider
+        self._tiers_by_gpu: dict[GPUType, list[tuple[str, ProviderInfo, PricingTier]]] = {}
+        # (provider_name, gpu_type) -> first matching tier
+        self._tier_lookup: dict[tuple[str, GPUType], PricingTier] = {}
         self._load_provider_info()
 
-    def _load_provider_info(self):
-        """Load provider info from all providers."""
-        for name, provider_class in PROVIDERS.items():
-            try:
-                provider = provider_class()
-                self._providers[name] = provider.info
-            except Exception:
-                pass
+    def _load_provider_info(self, timeout: float = 5.0):
+        """Load provider info from all providers concurrently.
+
+        Providers that fail, or don't finish within `timeout` seconds, are skipped.
+        Results are cached on disk for PROVIDER_CACHE_TTL seconds, or until a
+        provider module changes; set GPU_INFRA_NO_CACHE=1 to bypass the cache.
+        """
+        use_cache = os.environ.get("GPU_INFRA_NO_CACHE") != "1"
+        if use_cache and self._load_cached_provider_info():
+            self._index_tiers()
+            return
+
+        # Daemon threads, so a straggler can't hold up interpreter exit either
+        futures = {
+            name: run_in_daemon(lambda n=name: get_provider_class(n)().info)
+            for name in PROVIDER_SPECS
+        }
+        wait(futures.values(), timeout=timeout)
+        # Keep results in PROVIDER_SPECS order
+        for name, future in futures.items():
+            if future.done() and future.exception() is None:
+                self._providers[name] = future.result()
+        # Only cache complete results so a transient failure isn't persisted
+        if use_cache and len(self._providers) == len(PROVIDER_SPECS):
+            self._save_cached_provider_info()
+        self._index_tiers()
+
+    def _load_cached_provider_info(self) -> bool:
+        """Load provider info from the disk cache. Returns True on a fresh hit."""
+        try:
+            if time.time() - PROVIDER_CACHE_PATH.stat().st_mtime >= PROVIDER_CACHE_TTL:
+                return False
+            fingerprint, providers = pickle.loads(PROVIDER_CACHE_PATH.read_bytes())
+            if fingerprint != _provider_source_fingerprint():
+                return False
+            self._providers = providers
+            return True
+        except Exception:
+            return False
+
+    def _save_cached_provider_info(self):
+        """Write provider info to the disk cache atomically."""
+        try:
+            PROVIDER_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = PROVIDER_CACHE_PATH.with_suffix(".tmp")
+            tmp_path.write_bytes(pickle.dumps((_provider_source_fingerprint(), self._providers)))
+            tmp_path.replace(PROVIDER_CACHE_PATH)
+        except OSError:
+            pass
+
+    def _index_tiers(self):
+        """Rebuild the per-GPU-type tier index from the loaded provider info."""
+        index: dict[GPUType, list[tuple[str, ProviderInfo, PricingTier]]] = {}
+        lookup: dict[tuple[str, GPUType], PricingTier] = {}
+        for name, info in self._providers.items():
+            for tier in info.pricing:
+                key = (name, tier.gpu_type)
+                if key not in lookup:
+                    lookup[key] = tier
+                    index.setdefault(tier.gpu_type, []).append((name, info, tier))
+        self._tiers_by_gpu = index
+        self._tier_lookup = lookup
 
     def refresh_from_live(self, verbose: bool = True):
         """Fetch live pricing from provider APIs and override cached data."""
-        from .live_pricing import fetch_all_live
+        from .live_pricing import fetch_all_live_cached
 
-        live_data = fetch_all_live(verbose=verbose)
+        # No stale-while-revalidate: a short-lived CLI exits before a
+        # background refresh could land
+        live_data = fetch_all_live_cached(verbose=verbose, stale_while_revalidate=0)
         for provider_name, tiers in live_data.items():
             if provider_name not in self._providers:
                 continue
@@ -71,6 +174,7 @@ class GPUInfraAnalyzer:
                 min_billing_increment=info.min_billing_increment,
                 notes=info.notes,
             )
+        self._index_tiers()
 
     def get_all_providers(self) -> list[ProviderInfo]:
         """Get information about all providers."""
@@ -91,13 +195,10 @@ class GPUInfraAnalyzer:
         """
         results = []
 
-        for name, info in self._providers.items():
-            for tier in info.pricing:
-                if tier.gpu_type == gpu_type:
-                    results.append((name, tier.hourly_cost, False))
-                    if include_spot and tier.spot_cost:
-                        results.append((name, tier.spot_cost, True))
-                    break
+        for name, _, tier in self._tiers_by_gpu.get(gpu_type, ()):
+            results.append((name, tier.hourly_cost, False))
+            if include_spot and tier.spot_cost:
+                results.append((name, tier.spot_cost, True))
 
         return sorted(results, key=lambda x: x[1])
 
@@ -115,39 +216,8 @@ class GPUInfraAnalyzer:
             weight_cost: Weight for cost in scoring (0-1)
             weight_reliability: Weight for reliability in scoring (0-1)
         """
-        comparisons = []
-        min_cost = float("inf")
-        max_reliability = 0.0
-        best_cost_provider = ""
-        best_reliability_provider = ""
-
-        # First pass: collect data and find mins/maxes
-        for name, info in self._providers.items():
-            for tier in info.pricing:
-                if tier.gpu_type == gpu_type:
-                    cost = tier.hourly_cost
-                    if cost < min_cost:
-                        min_cost = cost
-                        best_cost_provider = name
-                    if info.reliability_score > max_reliability:
-                        max_reliability = info.reliability_score
-                        best_reliability_provider = name
-
-                    comparisons.append({
-                        "provider": name,
-                        "provider_name": info.name,
-                        "hourly_cost": tier.hourly_cost,
-                        "spot_cost": tier.spot_cost,
-                        "reliability": info.reliability_score,
-                        "vcpus": tier.vcpus,
-                        "ram_gb": tier.ram_gb,
-                        "supports_spot": info.supports_spot,
-                        "regions": info.regions,
-                        "notes": info.notes,
-                    })
-                    break
-
-        if not comparisons:
+        entries = self._tiers_by_gpu.get(gpu_type)
+        if not entries:
             return ProviderComparison(
                 gpu_type=gpu_type,
                 comparisons=[],
@@ -156,31 +226,48 @@ class GPUInfraAnalyzer:
                 best_overall="",
             )
 
-        # Second pass: calculate normalized scores
-        max_cost = max(c["hourly_cost"] for c in comparisons)
-        cost_range = max_cost - min_cost if max_cost != min_cost else 1
-        reliability_range = max_reliability - min(c["reliability"] for c in comparisons)
-        reliability_range = reliability_range if reliability_range > 0 else 1
-
-        best_score = -1
-        best_overall = ""
-
-        for comp in comparisons:
-            # Normalize cost (lower is better, so invert)
-            cost_score = 1 - (comp["hourly_cost"] - min_cost) / cost_range
-            # Normalize reliability
-            rel_score = comp["reliability"] / 100
+        # Single scan: track cost bounds and the cheapest / most reliable provider
+        min_cost = float("inf")
+        max_cost = float("-inf")
+        max_reliability = 0.0
+        best_cost_provider = ""
+        best_reliability_provider = ""
 
-            # Combined score
-            comp["cost_score"] = cost_score
-            comp["reliability_score_normalized"] = rel_score
-            comp["overall_score"] = weight_cost * cost_score + weight_reliability * rel_score
+        for name, info, tier in entries:
+            cost = tier.hourly_cost
+            if cost < min_cost:
+                min_cost = cost
+                best_cost_provider = name
+            if cost > max_cost:
+                max_cost = cost
+            if info.reliability_score > max_reliability:
+                max_reliability = info.reliability_score
+                best_reliability_provider = name
 
-            if comp["overall_score"] > best_score:
-                best_score = comp["overall_score"]
-                best_overall = comp["provider"]
+        cost_range = max_cost - min_cost if max_cost != min_cost else 1
 
-        # Sort by overall score
+        # Build result rows with normalized scores; cost is inverted since lower is better
+        comparisons = []
+        for name, info, tier in entries:
+            cost_score = 1 - (tier.hourly_cost - min_cost) / cost_range
+            rel_score = info.reliability_score / 100
+            comparisons.append({
+                "provider": name,
+                "provider_name": info.name,
+                "hourly_cost": tier.hourly_cost,
+                "spot_cost": tier.spot_cost,
+                "reliability": info.reliability_score,
+                "vcpus": tier.vcpus,
+                "ram_gb": tier.ram_gb,
+                "supports_spot": info.supports_spot,
+                "regions": info.regions,
+                "notes": info.notes,
+                "cost_score": cost_score,
+                "reliability_score_normalized": rel_score,
+                "overall_score": weight_cost * cost_score + weight_reliability * rel_score,
+            })
+
+        # Sort by overall score; the sort is stable, so ties keep provider order
         comparisons.sort(key=lambda x: x["overall_score"], reverse=True)
 
         return ProviderComparison(
@@ -188,7 +275,7 @@ class GPUInfraAnalyzer:
             comparisons=comparisons,
             best_cost=best_cost_provider,
             best_reliability=best_reliability_provider,
-            best_overall=best_overall,
+            best_overall=comparisons[0]["provider"],
         )
 
     def estimate_cost(
@@ -199,27 +286,23 @@ class GPUInfraAnalyzer:
         hours: float = 1.0,
     ) -> Optional[CostEstimate]:
         """Estimate the cost of running instances."""
-        info = self._providers.get(provider)
-        if not info:
+        tier = self._tier_lookup.get((provider, gpu_type))
+        if not tier:
             return None
 
-        for tier in info.pricing:
-            if tier.gpu_type == gpu_type:
-                on_demand = tier.hourly_cost * gpu_count * hours
-                spot = tier.spot_cost * gpu_count * hours if tier.spot_cost else None
-
-                return CostEstimate(
-                    provider=provider,
-                    gpu_type=gpu_type,
-                    gpu_count=gpu_count,
-                    hours=hours,
-                    on_demand_cost=on_demand,
-                    spot_cost=spot,
-                    monthly_on_demand=on_demand * 730 / hours,  # ~730 hours/month
-                    monthly_spot=spot * 730 / hours if spot else None,
-                )
+        on_demand = tier.hourly_cost * gpu_count * hours
+        spot = tier.spot_cost * gpu_count * hours if tier.spot_cost else None
 
-        return None
+        return CostEstimate(
+            provider=provider,
+            gpu_type=gpu_type,
+            gpu_count=gpu_count,
+            hours=hours,
+            on_demand_cost=on_demand,
+            spot_cost=spot,
+            monthly_on_demand=on_demand * 730 / hours,  # ~730 hours/month
+            monthly_spot=spot * 730 / hours if spot else None,
+        )
 
     def print_comparison_table(self, gpu_type: GPUType) -> str:
         """Generate a formatted comparison table."""
@@ -228,31 +311,23 @@ class GPUInfraAnalyzer:
         if not comparison.comparisons:
             return f"No providers found offering {gpu_type.value}"
 
-        lines = []
-        lines.append(f"\n{'='*80}")
-        lines.append(f"GPU Type: {gpu_type.value.upper()}")
-        lines.append(f"{'='*80}\n")
-
-        # Header
-        lines.append(f"{'Provider':<15} {'$/hr':<10} {'Spot $/hr':<12} {'Reliability':<12} {'Score':<10}")
-        lines.append("-" * 70)
-
-        for comp in comparison.comparisons:
-            spot_str = f"${comp['spot_cost']:.2f}" if comp['spot_cost'] else "N/A"
-            lines.append(
-                f"{comp['provider_name']:<15} "
-                f"${comp['hourly_cost']:<9.2f} "
-                f"{spot_str:<12} "
-                f"{comp['reliability']:<12.1f} "
-                f"{comp['overall_score']:.2f}"
-            )
-
-        lines.append("")
-        lines.append(f"Best for Cost:       {comparison.best_cost}")
-        lines.append(f"Best for Reliability: {comparison.best_reliability}")
-        lines.append(f"Best Overall:        {comparison.best_overall}")
+        rows = (
+            f"{comp['provider_name']:<15} "
+            f"${comp['hourly_cost']:<9.2f} "
+            f"{_format_spot(comp['spot_cost']):<12} "
+            f"{comp['reliability']:<12.1f} "
+            f"{comp['overall_score']:.2f}"
+            for comp in comparison.comparisons
+        )
+        footer = _TABLE_FOOTER_TEMPLATE.format(
+            best_cost=comparison.best_cost,
+            best_reliability=comparison.best_reliability,
+            best_overall=comparison.best_overall,
+        )
 
-        return "\n".join(lines)
+        return "\n".join(chain(
+            [_TABLE_HEADER_TEMPLATE.format(gpu=gpu_type.value.upper())], rows, [footer]
+        ))
 
     def get_recommendations(self, gpu_type: GPUType = GPUType.A100_40GB) -> dict:
         """Get recommendations for different use cases."""
@@ -269,8 +344,19 @@ class GPUInfraAnalyzer:
         if not comparison.comparisons:
             return recommendations
 
+        # Single scan for the most reliable, cheapest and cheapest-spot rows
+        comps = comparison.comparisons
+        for_prod = for_budget = comps[0]
+        for_spot = None
+        for comp in comps:
+            if comp["reliability"] > for_prod["reliability"]:
+                for_prod = comp
+            if comp["hourly_cost"] < for_budget["hourly_cost"]:
+                for_budget = comp
+            if comp["spot_cost"] and (for_spot is None or comp["spot_cost"] < for_spot["spot_cost"]):
+                for_spot = comp
+
         # Production: highest reliability
-        for_prod = max(comparison.comparisons, key=lambda x: x["reliability"])
         recommendations["for_production"] = {
             "provider": for_prod["provider"],
             "reason": f"Highest reliability ({for_prod['reliability']}%)",
@@ -278,28 +364,21 @@ class GPUInfraAnalyzer:
         }
 
         # Budget: lowest cost
-        for_budget = min(comparison.comparisons, key=lambda x: x["hourly_cost"])
         recommendations["for_budget"] = {
             "provider": for_budget["provider"],
             "reason": f"Lowest on-demand price (${for_budget['hourly_cost']}/hr)",
             "cost": for_budget["hourly_cost"],
         }
 
-        # Experimentation: best balance
+        # Experimentation: best balance (comparisons are sorted by overall score)
         recommendations["for_experimentation"] = {
             "provider": comparison.best_overall,
             "reason": "Best balance of cost and reliability",
-            "cost": next(
-                c["hourly_cost"]
-                for c in comparison.comparisons
-                if c["provider"] == comparison.best_overall
-            ),
+            "cost": comps[0]["hourly_cost"],
         }
 
         # Spot workloads: cheapest spot price
-        spot_options = [c for c in comparison.comparisons if c["spot_cost"]]
-        if spot_options:
-            for_spot = min(spot_options, key=lambda x: x["spot_cost"])
+        if for_spot:
             recommendations["for_spot_workloads"] = {
                 "provider": for_spot["provider"],
                 "reason": f"Cheapest spot price (${for_spot['spot_cost']}/hr)",
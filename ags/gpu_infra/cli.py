@@ -18,36 +18,52 @@ import argparse
 import os
 import subprocess
 import sys
+from functools import cache, lru_cache
 
 from .types import GPUType, InstanceStatus
 from .manager import GPUInstanceManager
 from .analyzer import GPUInfraAnalyzer
 
 
+_GPU_TYPE_MAP = {
+    "a100": GPUType.A100_40GB,
+    "a100-40": GPUType.A100_40GB,
+    "a100_40gb": GPUType.A100_40GB,
+    "a100-80": GPUType.A100_80GB,
+    "a100_80gb": GPUType.A100_80GB,
+    "h100": GPUType.H100,
+    "a10": GPUType.A10,
+    "4090": GPUType.RTX_4090,
+    "rtx4090": GPUType.RTX_4090,
+    "rtx_4090": GPUType.RTX_4090,
+    "3090": GPUType.RTX_3090,
+    "rtx3090": GPUType.RTX_3090,
+    "rtx_3090": GPUType.RTX_3090,
+    "v100": GPUType.V100,
+}
+
+
+@lru_cache(maxsize=None)
 def parse_gpu_type(gpu_str: str) -> GPUType:
     """Parse GPU type from string."""
-    mapping = {
-        "a100": GPUType.A100_40GB,
-        "a100-40": GPUType.A100_40GB,
-        "a100_40gb": GPUType.A100_40GB,
-        "a100-80": GPUType.A100_80GB,
-        "a100_80gb": GPUType.A100_80GB,
-        "h100": GPUType.H100,
-        "a10": GPUType.A10,
-        "4090": GPUType.RTX_4090,
-        "rtx4090": GPUType.RTX_4090,
-        "rtx_4090": GPUType.RTX_4090,
-        "3090": GPUType.RTX_3090,
-        "rtx3090": GPUType.RTX_3090,
-        "rtx_3090": GPUType.RTX_3090,
-        "v100": GPUType.V100,
-    }
-    return mapping.get(gpu_str.lower(), GPUType.A100_40GB)
+    return _GPU_TYPE_MAP.get(gpu_str.lower(), GPUType.A100_40GB)
+
+
+@cache
+def get_analyzer() -> GPUInfraAnalyzer:
+    """Get the shared analyzer, creating it on first use."""
+    return GPUInfraAnalyzer()
+
+
+@cache
+def get_manager() -> GPUInstanceManager:
+    """Get the shared instance manager, creating it on first use."""
+    return GPUInstanceManager()
 
 
 def _make_analyzer(live: bool = False) -> GPUInfraAnalyzer:
-    """Create analyzer, optionally refreshing with live pricing."""
-    analyzer = GPUInfraAnalyzer()
+    """Get the analyzer, optionally refreshing with live pricing."""
+    analyzer = get_analyzer()
     if live:
         analyzer.refresh_from_live(verbose=True)
     return analyzer
@@ -84,7 +100,7 @@ def cmd_recommend(args):
 
 def cmd_list(args):
     """List running instances."""
-    manager = GPUInstanceManager()
+    manager = get_manager()
     instances = manager.list_instances(provider=args.provider)
 
     if not instances:
@@ -107,7 +123,7 @@ def cmd_list(args):
 
 def cmd_create(args):
     """Create a new GPU instance."""
-    manager = GPUInstanceManager()
+    manager = get_manager()
     gpu_type = parse_gpu_type(args.gpu) if args.gpu else GPUType.A100_40GB
 
     print(f"Creating {gpu_type.value} instance on {args.provider}...")
@@ -144,7 +160,7 @@ def cmd_create(args):
 
 def cmd_terminate(args):
     """Terminate an instance."""
-    manager = GPUInstanceManager()
+    manager = get_manager()
 
     print(f"Terminating {args.instance_id} on {args.provider}...")
 
@@ -157,7 +173,7 @@ def cmd_terminate(args):
 
 def cmd_ssh(args):
     """SSH into an instance."""
-    manager = GPUInstanceManager()
+    manager = get_manager()
 
     # Get instance details
     instance = manager.get_instance(args.provider, args.instance_id)
@@ -199,7 +215,7 @@ def cmd_ssh(args):
 
 def cmd_status(args):
     """Get status of an instance."""
-    manager = GPUInstanceManager()
+    manager = get_manager()
     instance = manager.get_instance(args.provider, args.instance_id)
 
     if not instance:
@@ -222,7 +238,7 @@ def cmd_status(args):
 
 def cmd_providers(args):
     """List available providers."""
-    analyzer = GPUInfraAnalyzer()
+    analyzer = get_analyzer()
     providers = analyzer.get_all_providers()
 
     print(f"\n{'Provider':<15} {'Reliability':<12} {'Spot':<6} {'Regions':<30}")
@@ -9,14 +9,55 @@ Providers with public APIs (no auth needed):
 CoreWeave requires auth, so we skip live fetch for it.
 """
 
+import asyncio
 import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from functools import lru_cache
+from pathlib import Path
+from statistics import median_high
 from typing import Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib parser is used without it
+    orjson = None
+
+try:
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = "br, gzip"
+except ImportError:  # without a brotli decoder, only advertise gzip
+    _ACCEPT_ENCODING = "gzip"
 
 from .types import GPUType, PricingTier
 
 
+# Shared session so repeated fetches reuse pooled keep-alive connections
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=16))
+_USER_AGENT = "ags-gpu-infra/0.1"
+_SESSION.headers["User-Agent"] = _USER_AGENT
+_SESSION.headers["Accept-Encoding"] = _ACCEPT_ENCODING
+
+# Response bodies are parsed from raw bytes, with orjson when it is installed
+_loads = orjson.loads if orjson is not None else json.loads
+
+_LAMBDA_URL = "https://cloud.lambdalabs.com/api/v1/instance-types"
+_RUNPOD_URL = "https://api.runpod.io/graphql"
+_VASTAI_URL = "https://console.vast.ai/api/v0/bundles"
+
+# Only the fields the parser reads, encoded once at import time
+_RUNPOD_QUERY = "{gpuTypes{displayName memoryInGb lowestPrice{minimumBidPrice uninterruptablePrice}}}"
+_RUNPOD_BODY = json.dumps({"query": _RUNPOD_QUERY}).encode()
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
 # Map provider GPU names -> our GPUType enum
 _LAMBDA_GPU_MAP = {
     "gpu_1x_a100": GPUType.A100_40GB,
@@ -27,6 +68,9 @@ _LAMBDA_GPU_MAP = {
     "gpu_1x_h100_pcie": GPUType.H100,
 }
 
+# Longest slug first, so prefix matching prefers the most specific entry
+_LAMBDA_PREFIXES = tuple(sorted(_LAMBDA_GPU_MAP, key=len, reverse=True))
+
 _RUNPOD_GPU_MAP = {
     "NVIDIA A100 80GB": GPUType.A100_80GB,
     "NVIDIA A100-80GB": GPUType.A100_80GB,
@@ -43,202 +87,474 @@ _RUNPOD_GPU_MAP = {
     "NVIDIA L40S": GPUType.L40S,
 }
 
+# Lowercased once so matching doesn't re-lower the constant keys per GPU
+_RUNPOD_GPU_MAP_LOWER = [(key.lower(), gtype) for key, gtype in _RUNPOD_GPU_MAP.items()]
+
+
+@lru_cache(maxsize=128)
+def _match_lambda_gpu(type_id: str) -> Optional[GPUType]:
+    """Map a Lambda instance-type slug to a GPUType.
+
+    Known slugs hit the map directly; other variants (e.g. a new
+    `gpu_1x_a100_pcie`) fall back to the longest known slug they start with.
+    """
+    gpu_type = _LAMBDA_GPU_MAP.get(type_id)
+    if gpu_type is None:
+        for slug in _LAMBDA_PREFIXES:
+            if type_id.startswith(slug):
+                return _LAMBDA_GPU_MAP[slug]
+    return gpu_type
+
+
+def _parse_lambda(payload: dict) -> list[PricingTier]:
+    """Build pricing tiers from a Lambda Labs instance-types response."""
+    tiers = []
+    data = payload.get("data", {})
+
+    for type_id, info in data.items():
+        specs = info.get("instance_type", {}).get("specs", {})
+        price = info.get("instance_type", {}).get("price_cents_per_hour")
+        if price is None:
+            continue
+
+        gpu_type = _match_lambda_gpu(type_id)
+        if not gpu_type:
+            continue
+
+        hourly = price / 100.0
+        vcpus = specs.get("vcpus", 0)
+        ram = specs.get("memory_gib", 0)
+        storage = specs.get("storage_gib", 0)
+
+        tiers.append(PricingTier(
+            gpu_type=gpu_type,
+            hourly_cost=hourly,
+            vcpus=vcpus,
+            ram_gb=ram,
+            storage_gb=storage,
+        ))
+    return tiers
+
+
+@lru_cache(maxsize=256)
+def _match_runpod_gpu(name_lower: str) -> Optional[GPUType]:
+    """Map a lowercased RunPod display name to a GPUType.
+
+    The first map key that contains, or is contained in, the name wins.
+    RunPod returns the same few dozen names on every fetch, so results are
+    memoized and the scan runs once per distinct name.
+    """
+    for key_lower, gtype in _RUNPOD_GPU_MAP_LOWER:
+        if key_lower in name_lower or name_lower in key_lower:
+            return gtype
+    return None
+
+
+def _parse_runpod(payload: dict) -> list[PricingTier]:
+    """Build pricing tiers from a RunPod gpuTypes GraphQL response."""
+    tiers = []
+    gpu_types = payload.get("data", {}).get("gpuTypes", [])
+
+    for gpu in gpu_types:
+        gpu_type = _match_runpod_gpu(gpu.get("displayName", "").lower())
+        if not gpu_type:
+            continue
+
+        lowest = gpu.get("lowestPrice", {}) or {}
+        on_demand = lowest.get("uninterruptablePrice")
+        spot = lowest.get("minimumBidPrice")
+        if on_demand is None:
+            continue
+
+        vram = gpu.get("memoryInGb", 0)
+
+        tiers.append(PricingTier(
+            gpu_type=gpu_type,
+            hourly_cost=float(on_demand),
+            spot_cost=float(spot) if spot else None,
+            vcpus=16,
+            ram_gb=vram * 4,  # rough estimate
+            storage_gb=100,
+        ))
+    return tiers
+
+
+def _vast_params(gpu_name: str) -> dict:
+    """Query parameters for rentable single-GPU Vast.ai offers."""
+    return {"q": json.dumps({
+        "gpu_name": {"eq": gpu_name},
+        "rentable": {"eq": True},
+        "num_gpus": {"eq": 1},
+    })}
+
+
+def _parse_vast(payload: dict, gpu_type: GPUType) -> Optional[PricingTier]:
+    """Build a pricing tier from the median of a Vast.ai bundles response."""
+    offers = payload.get("offers", [])
+    if not offers:
+        return None
+
+    # Collect on-demand and spot (interruptible) prices in one pass
+    prices = []
+    spot_prices = []
+    for o in offers:
+        price = o.get("dph_total")
+        if price:
+            prices.append(price)
+        bid = o.get("min_bid")
+        if bid and bid > 0:
+            spot_prices.append(bid)
+
+    if not prices:
+        return None
+
+    # Upper median for even counts
+    median_price = median_high(prices)
+    spot_median = median_high(spot_prices) if spot_prices else None
+
+    return PricingTier(
+        gpu_type=gpu_type,
+        hourly_cost=round(median_price, 2),
+        spot_cost=round(spot_median, 2) if spot_median else None,
+        vcpus=16,
+        ram_gb=128,
+        storage_gb=100,
+    )
+
+
+# Per-endpoint circuit breaker: name -> (last failure time, consecutive failures).
+# A failing endpoint is skipped for min(BREAKER_MAX_BACKOFF, 2**failures) seconds.
+BREAKER_MAX_BACKOFF = 60
+_BREAKER: dict[str, tuple[float, int]] = {}
+_breaker_lock = threading.Lock()
+
+
+def _breaker_open(name: str) -> bool:
+    """Return True (and report it) if `name` is inside its back-off window."""
+    with _breaker_lock:
+        failed_at, count = _BREAKER.get(name, (0.0, 0))
+    backoff = min(BREAKER_MAX_BACKOFF, 2 ** count)
+    if count and time.time() - failed_at < backoff:
+        print(f"  [{name}] skipped after {count} failure(s); retrying within {backoff}s")
+        return True
+    return False
+
+
+def _record_result(name: str, ok: bool):
+    with _breaker_lock:
+        if ok:
+            _BREAKER.pop(name, None)
+        else:
+            _BREAKER[name] = (time.time(), _BREAKER.get(name, (0.0, 0))[1] + 1)
+
 
 def fetch_lambda_live() -> list[PricingTier]:
     """Fetch live pricing from Lambda Labs public API."""
-    tiers = []
+    if _breaker_open("lambda"):
+        return []
     try:
-        resp = requests.get(
-            "https://cloud.lambdalabs.com/api/v1/instance-types",
-            timeout=10,
-        )
+        resp = _SESSION.get(_LAMBDA_URL, timeout=10)
         resp.raise_for_status()
-        data = resp.json().get("data", {})
-
-        for type_id, info in data.items():
-            specs = info.get("instance_type", {}).get("specs", {})
-            price = info.get("instance_type", {}).get("price_cents_per_hour")
-            if price is None:
-                continue
-
-            # Try to map the GPU
-            gpu_type = None
-            for key, gtype in _LAMBDA_GPU_MAP.items():
-                if key in type_id:
-                    gpu_type = gtype
-                    break
-            if not gpu_type:
-                continue
-
-            hourly = price / 100.0
-            vcpus = specs.get("vcpus", 0)
-            ram = specs.get("memory_gib", 0)
-            storage = specs.get("storage_gib", 0)
-
-            tiers.append(PricingTier(
-                gpu_type=gpu_type,
-                hourly_cost=hourly,
-                vcpus=vcpus,
-                ram_gb=ram,
-                storage_gb=storage,
-            ))
+        tiers = _parse_lambda(_loads(resp.content))
+        _record_result("lambda", True)
+        return tiers
     except Exception as e:
+        _record_result("lambda", False)
         print(f"  [lambda] live fetch failed: {e}")
-    return tiers
+    return []
 
 
 def fetch_runpod_live() -> list[PricingTier]:
     """Fetch live pricing from RunPod public GraphQL API."""
-    tiers = []
-    query = """
-    {
-        gpuTypes {
-            id
-            displayName
-            memoryInGb
-            secureCloud
-            communityCloud
-            lowestPrice {
-                minimumBidPrice
-                uninterruptablePrice
-            }
-        }
-    }
-    """
+    if _breaker_open("runpod"):
+        return []
     try:
-        resp = requests.post(
-            "https://api.runpod.io/graphql",
-            json={"query": query},
-            timeout=10,
-        )
+        resp = _SESSION.post(_RUNPOD_URL, data=_RUNPOD_BODY, headers=_JSON_HEADERS, timeout=10)
         resp.raise_for_status()
-        gpu_types = resp.json().get("data", {}).get("gpuTypes", [])
-
-        for gpu in gpu_types:
-            name = gpu.get("displayName", "")
-            gpu_type = None
-            for key, gtype in _RUNPOD_GPU_MAP.items():
-                if key.lower() in name.lower() or name.lower() in key.lower():
-                    gpu_type = gtype
-                    break
-            if not gpu_type:
-                continue
-
-            lowest = gpu.get("lowestPrice", {}) or {}
-            on_demand = lowest.get("uninterruptablePrice")
-            spot = lowest.get("minimumBidPrice")
-            if on_demand is None:
-                # Try secureCloud pricing
-                secure = gpu.get("secureCloud", {}) or {}
-                on_demand = secure if isinstance(secure, (int, float)) else None
-            if on_demand is None:
-                continue
-
-            vram = gpu.get("memoryInGb", 0)
-
-            tiers.append(PricingTier(
-                gpu_type=gpu_type,
-                hourly_cost=float(on_demand),
-                spot_cost=float(spot) if spot else None,
-                vcpus=16,
-                ram_gb=vram * 4,  # rough estimate
-                storage_gb=100,
-            ))
+        tiers = _parse_runpod(_loads(resp.content))
+        _record_result("runpod", True)
+        return tiers
     except Exception as e:
+        _record_result("runpod", False)
         print(f"  [runpod] live fetch failed: {e}")
-    return tiers
+    return []
+
+
+_VASTAI_GPU_QUERIES = [
+    ("A100", GPUType.A100_40GB),
+    ("A100_80GB", GPUType.A100_80GB),
+    ("RTX 4090", GPUType.RTX_4090),
+    ("RTX 3090", GPUType.RTX_3090),
+    ("H100", GPUType.H100),
+]
+
+
+def _fetch_one_vast(query: tuple[str, GPUType]) -> Optional[PricingTier]:
+    """Fetch the median Vast.ai offer price for a single GPU name."""
+    gpu_name, gpu_type = query
+    name = f"vastai/{gpu_name}"
+    if _breaker_open(name):
+        return None
+    try:
+        resp = _SESSION.get(_VASTAI_URL, params=_vast_params(gpu_name), timeout=10)
+        resp.raise_for_status()
+        tier = _parse_vast(_loads(resp.content), gpu_type)
+        _record_result(name, True)
+        return tier
+    except Exception as e:
+        _record_result(name, False)
+        print(f"  [{name}] live fetch failed: {e}")
+        return None
 
 
 def fetch_vastai_live() -> list[PricingTier]:
-    """Fetch live pricing from Vast.ai public API (median of current offers)."""
-    tiers = []
-    gpu_queries = [
-        ("A100", GPUType.A100_40GB),
-        ("A100_80GB", GPUType.A100_80GB),
-        ("RTX 4090", GPUType.RTX_4090),
-        ("RTX 3090", GPUType.RTX_3090),
-        ("H100", GPUType.H100),
-    ]
-
-    for gpu_name, gpu_type in gpu_queries:
-        try:
-            resp = requests.get(
-                "https://console.vast.ai/api/v0/bundles",
-                params={"q": json.dumps({
-                    "gpu_name": {"eq": gpu_name},
-                    "rentable": {"eq": True},
-                    "num_gpus": {"eq": 1},
-                })},
-                timeout=10,
-            )
-            resp.raise_for_status()
-            offers = resp.json().get("offers", [])
-            if not offers:
-                continue
-
-            # Get median price
-            prices = sorted(o.get("dph_total", 0) for o in offers if o.get("dph_total"))
-            if not prices:
-                continue
-            median_price = prices[len(prices) // 2]
-
-            # Spot prices (interruptible)
-            spot_prices = sorted(
-                o.get("min_bid", 0) for o in offers
-                if o.get("min_bid") and o["min_bid"] > 0
-            )
-            spot_median = spot_prices[len(spot_prices) // 2] if spot_prices else None
-
-            tiers.append(PricingTier(
-                gpu_type=gpu_type,
-                hourly_cost=round(median_price, 2),
-                spot_cost=round(spot_median, 2) if spot_median else None,
-                vcpus=16,
-                ram_gb=128,
-                storage_gb=100,
-            ))
-        except Exception as e:
-            print(f"  [vastai/{gpu_name}] live fetch failed: {e}")
+    """Fetch live pricing from Vast.ai public API (median of current offers).
 
-    return tiers
+    The per-GPU queries run concurrently over the shared session.
+    """
+    with ThreadPoolExecutor(max_workers=len(_VASTAI_GPU_QUERIES)) as executor:
+        results = executor.map(_fetch_one_vast, _VASTAI_GPU_QUERIES)
+        return [tier for tier in results if tier is not None]
+
+
+_LIVE_FETCHERS = {
+    "lambda": fetch_lambda_live,
+    "runpod": fetch_runpod_live,
+    "vastai": fetch_vastai_live,
+}
+
+
+def _collect_results(
+    tiers_by_provider: dict[str, list[PricingTier]], verbose: bool
+) -> dict[str, list[PricingTier]]:
+    """Drop empty providers and report what was fetched, in provider order."""
+    results = {}
+    for name, tiers in tiers_by_provider.items():
+        if tiers:
+            results[name] = tiers
+            if verbose:
+                print(f"  [{name}] got {len(tiers)} GPU types")
+
+    if verbose and not results:
+        print("  No live data fetched, using cached pricing.")
+
+    return results
 
 
 def fetch_all_live(verbose: bool = True) -> dict[str, list[PricingTier]]:
     """
     Fetch live pricing from all providers that have public APIs.
 
+    Providers are fetched concurrently.
+
     Returns dict of provider_name -> list[PricingTier].
     """
-    results = {}
-
     if verbose:
         print("Fetching live pricing...")
+        for name in _LIVE_FETCHERS:
+            print(f"  [{name}] fetching...")
 
-    if verbose:
-        print("  [lambda] fetching...")
-    lam = fetch_lambda_live()
-    if lam:
-        results["lambda"] = lam
-        if verbose:
-            print(f"  [lambda] got {len(lam)} GPU types")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {name: executor.submit(fetch) for name, fetch in _LIVE_FETCHERS.items()}
 
-    if verbose:
-        print("  [runpod] fetching...")
-    rp = fetch_runpod_live()
-    if rp:
-        results["runpod"] = rp
-        if verbose:
-            print(f"  [runpod] got {len(rp)} GPU types")
+    # Collect in provider order so the result shape doesn't depend on timing
+    return _collect_results({name: f.result() for name, f in futures.items()}, verbose)
 
-    if verbose:
-        print("  [vastai] fetching...")
-    va = fetch_vastai_live()
-    if va:
-        results["vastai"] = va
-        if verbose:
-            print(f"  [vastai] got {len(va)} GPU types")
 
-    if verbose and not results:
-        print("  No live data fetched, using cached pricing.")
+LIVE_PRICING_CACHE_PATH = Path(os.path.expanduser("~/.gpu_infra")) / "live_pricing_cache.json"
+
+_refresh_lock = threading.Lock()
+
+
+def _tier_to_json(tier: PricingTier) -> dict:
+    data = asdict(tier)
+    data["gpu_type"] = tier.gpu_type.value
+    return data
+
 
+def _tier_from_json(data: dict) -> PricingTier:
+    return PricingTier(**{**data, "gpu_type": GPUType(data["gpu_type"])})
+
+
+def _read_pricing_cache() -> dict[str, tuple[list[PricingTier], float]]:
+    """Read cached live pricing as provider -> (tiers, fetched_at)."""
+    try:
+        with open(LIVE_PRICING_CACHE_PATH) as f:
+            raw = json.load(f)
+        return {
+            name: ([_tier_from_json(t) for t in entry["tiers"]], entry["fetched_at"])
+            for name, entry in raw.items()
+        }
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+def _write_pricing_cache(results: dict[str, list[PricingTier]]):
+    """Merge freshly fetched providers into the cache file, written atomically."""
+    now = time.time()
+    cache = {
+        name: {"tiers": [_tier_to_json(t) for t in tiers], "fetched_at": fetched_at}
+        for name, (tiers, fetched_at) in _read_pricing_cache().items()
+    }
+    for name, tiers in results.items():
+        cache[name] = {"tiers": [_tier_to_json(t) for t in tiers], "fetched_at": now}
+    try:
+        LIVE_PRICING_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = LIVE_PRICING_CACHE_PATH.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(cache, f)
+        tmp_path.replace(LIVE_PRICING_CACHE_PATH)
+    except OSError:
+        pass
+
+
+def _refresh_live_pricing(verbose: bool) -> dict[str, list[PricingTier]]:
+    """Fetch live pricing and store whatever was fetched in the cache."""
+    results = fetch_all_live(verbose=verbose)
+    if results:
+        _write_pricing_cache(results)
     return results
+
+
+def _refresh_in_background():
+    # Skip if another refresh is already running
+    if not _refresh_lock.acquire(blocking=False):
+        return
+    try:
+        _refresh_live_pricing(verbose=False)
+    finally:
+        _refresh_lock.release()
+
+
+def fetch_all_live_cached(
+    verbose: bool = True,
+    caching_ttl: float = 300,
+    stale_while_revalidate: float = 0,
+) -> dict[str, list[PricingTier]]:
+    """
+    Fetch live pricing, reusing provider pricing cached within `caching_ttl`.
+
+    If any provider's cached pricing has expired or is missing, this blocks on
+    fetch_all_live, keeping still-fresh cached pricing for providers the fetch
+    came back empty for.
+
+    Long-lived processes may pass `stale_while_revalidate` to instead accept
+    pricing up to `caching_ttl + stale_while_revalidate` seconds old while a
+    background thread refreshes the cache. Keep it at 0 in short-lived
+    processes such as the CLI: the daemon refresh thread dies with the
+    process, so the cache would never be refreshed.
+
+    Returns dict of provider_name -> list[PricingTier].
+    """
+    now = time.time()
+    usable = {}
+    stale = False
+    for name, (tiers, fetched_at) in _read_pricing_cache().items():
+        age = now - fetched_at
+        if age < caching_ttl + stale_while_revalidate:
+            usable[name] = tiers
+            stale = stale or age >= caching_ttl
+
+    if any(name not in usable for name in _LIVE_FETCHERS):
+        # Serialize with any background refresh writing the same cache
+        with _refresh_lock:
+            results = _refresh_live_pricing(verbose)
+        return {
+            name: results.get(name) or usable[name]
+            for name in _LIVE_FETCHERS
+            if name in results or name in usable
+        }
+
+    if stale:
+        threading.Thread(target=_refresh_in_background, daemon=True).start()
+    if verbose:
+        print(f"Using cached live pricing ({'stale, refreshing' if stale else 'fresh'}).")
+    return usable
+
+
+async def _fetch_lambda_async(client) -> list[PricingTier]:
+    if _breaker_open("lambda"):
+        return []
+    try:
+        resp = await client.get(_LAMBDA_URL)
+        resp.raise_for_status()
+        tiers = _parse_lambda(_loads(resp.content))
+        _record_result("lambda", True)
+        return tiers
+    except Exception as e:
+        _record_result("lambda", False)
+        print(f"  [lambda] live fetch failed: {e}")
+    return []
+
+
+async def _fetch_runpod_async(client) -> list[PricingTier]:
+    if _breaker_open("runpod"):
+        return []
+    try:
+        resp = await client.post(_RUNPOD_URL, content=_RUNPOD_BODY, headers=_JSON_HEADERS)
+        resp.raise_for_status()
+        tiers = _parse_runpod(_loads(resp.content))
+        _record_result("runpod", True)
+        return tiers
+    except Exception as e:
+        _record_result("runpod", False)
+        print(f"  [runpod] live fetch failed: {e}")
+    return []
+
+
+async def _fetch_one_vast_async(client, query: tuple[str, GPUType]) -> Optional[PricingTier]:
+    gpu_name, gpu_type = query
+    name = f"vastai/{gpu_name}"
+    if _breaker_open(name):
+        return None
+    try:
+        resp = await client.get(_VASTAI_URL, params=_vast_params(gpu_name))
+        resp.raise_for_status()
+        tier = _parse_vast(_loads(resp.content), gpu_type)
+        _record_result(name, True)
+        return tier
+    except Exception as e:
+        _record_result(name, False)
+        print(f"  [{name}] live fetch failed: {e}")
+        return None
+
+
+async def fetch_all_live_async(verbose: bool = True) -> dict[str, list[PricingTier]]:
+    """
+    Async variant of fetch_all_live using a single httpx.AsyncClient.
+
+    All provider requests, including each Vast.ai GPU query, are issued
+    concurrently on the running event loop. HTTP/2 is used when the `h2`
+    package is installed, and brotli-compressed responses are requested when
+    `brotli` is.
+
+    Returns dict of provider_name -> list[PricingTier].
+    """
+    import httpx
+
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+
+    if verbose:
+        print("Fetching live pricing...")
+        for name in _LIVE_FETCHERS:
+            print(f"  [{name}] fetching...")
+
+    async with httpx.AsyncClient(
+        http2=http2,
+        timeout=10,
+        headers={"User-Agent": _USER_AGENT, "Accept-Encoding": _ACCEPT_ENCODING},
+    ) as client:
+        lam, rp, *vast = await asyncio.gather(
+            _fetch_lambda_async(client),
+            _fetch_runpod_async(client),
+            *(_fetch_one_vast_async(client, q) for q in _VASTAI_GPU_QUERIES),
+        )
+
+    return _collect_results(
+        {"lambda": lam, "runpod": rp, "vastai": [t for t in vast if t is not None]},
+        verbose,
+    )
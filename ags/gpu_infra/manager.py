@@ -2,13 +2,26 @@
 GPU Instance Manager - Manage instances across multiple providers.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 import json
 import os
+import sqlite3
+import threading
 from pathlib import Path
 
 from .types import Instance, GPUType, InstanceStatus
-from .providers import PROVIDERS, BaseProvider
+from .providers import PROVIDER_SPECS, BaseProvider, get_provider_class
+
+
+# Short polls before falling back to poll_interval in wait_for_ready
+WAIT_FOR_READY_INITIAL_DELAYS = (1, 1, 2, 5)
+
+# Columns of the local instances table, in insertion order
+INSTANCE_COLUMNS = (
+    "provider", "id", "gpu_type", "gpu_count", "status", "ip_address",
+    "ssh_port", "ssh_user", "ssh_key_path", "region", "hourly_cost",
+)
 
 
 class GPUInstanceManager:
@@ -19,77 +32,128 @@ class GPUInstanceManager:
         self._config_dir = Path(config_dir or os.path.expanduser("~/.gpu_infra"))
         self._config_dir.mkdir(parents=True, exist_ok=True)
         self._instances_file = self._config_dir / "instances.json"
-        self._load_providers()
-
-    def _load_providers(self):
-        """Initialize available providers."""
-        for name, provider_class in PROVIDERS.items():
+        self._instances_db = self._config_dir / "instances.db"
+        self._conn: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+
+    def _provider(self, name: str) -> Optional[BaseProvider]:
+        """Import and initialize a provider on first use."""
+        if name not in self._providers:
+            if name not in PROVIDER_SPECS:
+                return None
             try:
-                self._providers[name] = provider_class()
+                self._providers[name] = get_provider_class(name)()
             except Exception:
-                pass
+                return None
+        return self._providers[name]
+
+    def _db(self) -> sqlite3.Connection:
+        """Open the local instance database on first use."""
+        if self._conn is None:
+            conn = sqlite3.connect(self._instances_db, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS instances ("
+                "provider TEXT NOT NULL, id TEXT NOT NULL, gpu_type TEXT, gpu_count INTEGER, "
+                "status TEXT, ip_address TEXT, ssh_port INTEGER, ssh_user TEXT, "
+                "ssh_key_path TEXT, region TEXT, hourly_cost REAL, "
+                "PRIMARY KEY (provider, id))"
+            )
+            self._conn = conn
+            self._import_legacy_instances()
+        return self._conn
+
+    def _import_legacy_instances(self):
+        """Move records from the old instances.json into the database."""
+        legacy = self._load_local_instances()
+        if not legacy:
+            return
+        with self._db_lock:
+            for record in legacy.values():
+                self._conn.execute(
+                    f"INSERT OR IGNORE INTO instances ({', '.join(INSTANCE_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(INSTANCE_COLUMNS))})",
+                    [record.get(col) for col in INSTANCE_COLUMNS],
+                )
+        self._instances_file.rename(self._instances_file.with_suffix(".json.migrated"))
 
     def _save_instance_locally(self, instance: Instance):
         """Save instance info locally for tracking."""
-        instances = self._load_local_instances()
-        instances[f"{instance.provider}:{instance.id}"] = {
-            "id": instance.id,
-            "provider": instance.provider,
-            "gpu_type": instance.gpu_type.value,
-            "gpu_count": instance.gpu_count,
-            "status": instance.status.value,
-            "ip_address": instance.ip_address,
-            "ssh_port": instance.ssh_port,
-            "ssh_user": instance.ssh_user,
-            "ssh_key_path": instance.ssh_key_path,
-            "region": instance.region,
-            "hourly_cost": instance.hourly_cost,
-        }
-        with open(self._instances_file, "w") as f:
-            json.dump(instances, f, indent=2)
+        record = (
+            instance.provider,
+            instance.id,
+            instance.gpu_type.value,
+            instance.gpu_count,
+            instance.status.value,
+            instance.ip_address,
+            instance.ssh_port,
+            instance.ssh_user,
+            instance.ssh_key_path,
+            instance.region,
+            instance.hourly_cost,
+        )
+        db = self._db()
+        with self._db_lock:
+            db.execute(
+                f"INSERT OR REPLACE INTO instances ({', '.join(INSTANCE_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(INSTANCE_COLUMNS))})",
+                record,
+            )
 
     def _load_local_instances(self) -> dict:
-        """Load locally tracked instances."""
+        """Load instances tracked in the legacy instances.json file."""
         if self._instances_file.exists():
             with open(self._instances_file) as f:
                 return json.load(f)
         return {}
 
+    def _local_instance(self, provider: str, instance_id: str) -> Optional[dict]:
+        """Look up one locally tracked instance."""
+        db = self._db()
+        with self._db_lock:
+            row = db.execute(
+                "SELECT * FROM instances WHERE provider = ? AND id = ?", (provider, instance_id)
+            ).fetchone()
+        return dict(row) if row else None
+
     def _remove_local_instance(self, provider: str, instance_id: str):
         """Remove instance from local tracking."""
-        instances = self._load_local_instances()
-        key = f"{provider}:{instance_id}"
-        if key in instances:
-            del instances[key]
-            with open(self._instances_file, "w") as f:
-                json.dump(instances, f, indent=2)
+        db = self._db()
+        with self._db_lock:
+            db.execute("DELETE FROM instances WHERE provider = ? AND id = ?", (provider, instance_id))
 
     def get_provider(self, name: str) -> Optional[BaseProvider]:
         """Get a specific provider."""
-        return self._providers.get(name)
+        return self._provider(name)
 
     def list_providers(self) -> list[str]:
         """List available providers."""
-        return list(self._providers.keys())
+        return list(PROVIDER_SPECS)
 
     def list_instances(self, provider: Optional[str] = None) -> list[Instance]:
         """
         List all running instances, optionally filtered by provider.
 
+        Without a filter, all providers are queried concurrently.
+
         Args:
             provider: Optional provider name to filter by
         """
         instances = []
 
         if provider:
-            if provider in self._providers:
-                instances.extend(self._providers[provider].list_instances())
+            prov = self._provider(provider)
+            if prov:
+                instances.extend(prov.list_instances())
         else:
-            for prov in self._providers.values():
-                try:
-                    instances.extend(prov.list_instances())
-                except Exception:
-                    pass
+            provs = [p for p in map(self._provider, PROVIDER_SPECS) if p is not None]
+            # Query providers concurrently; collect in provider order
+            with ThreadPoolExecutor(max_workers=max(1, len(provs))) as executor:
+                futures = [executor.submit(p.list_instances) for p in provs]
+            for future in futures:
+                if future.exception() is None:
+                    instances.extend(future.result())
 
         return instances
 
@@ -115,12 +179,13 @@ class GPUInstanceManager:
             ssh_key_name: Name of SSH key registered with provider
             ssh_key_path: Local path to SSH private key (for SSH command)
             name: Optional instance name
-            **kwargs: Provider-specific options
+            **kwargs: Provider-specific options (e.g. idempotency_key to make a
+                retried create safe on Lambda, RunPod and Vast.ai)
         """
-        if provider not in self._providers:
-            raise ValueError(f"Unknown provider: {provider}. Available: {list(self._providers.keys())}")
+        prov = self._provider(provider)
+        if prov is None:
+            raise ValueError(f"Unknown provider: {provider}. Available: {self.list_providers()}")
 
-        prov = self._providers[provider]
         instance = prov.create_instance(
             gpu_type=gpu_type,
             gpu_count=gpu_count,
@@ -147,20 +212,50 @@ class GPUInstanceManager:
             provider: Provider name
             instance_id: Instance ID
         """
-        if provider not in self._providers:
+        prov = self._provider(provider)
+        if prov is None:
             return False
 
-        success = self._providers[provider].terminate_instance(instance_id)
+        success = prov.terminate_instance(instance_id)
         if success:
             self._remove_local_instance(provider, instance_id)
 
         return success
 
+    def terminate_instances(self, provider: str, instance_ids: list[str]) -> dict[str, bool]:
+        """
+        Terminate several instances on one provider.
+
+        Args:
+            provider: Provider name
+            instance_ids: Instance IDs to terminate
+
+        Returns a dict of instance ID -> whether it was terminated.
+        """
+        prov = self._provider(provider)
+        if prov is None:
+            return {instance_id: False for instance_id in instance_ids}
+
+        results = prov.terminate_instances(instance_ids)
+        for instance_id, success in results.items():
+            if success:
+                self._remove_local_instance(provider, instance_id)
+
+        return results
+
     def get_instance(self, provider: str, instance_id: str) -> Optional[Instance]:
         """Get details of a specific instance."""
-        if provider not in self._providers:
+        prov = self._provider(provider)
+        if prov is None:
             return None
-        return self._providers[provider].get_instance(instance_id)
+        return prov.get_instance(instance_id)
+
+    def get_instances(self, provider: str, instance_ids: list[str]) -> dict[str, Instance]:
+        """Get several instances from one provider, batched where the provider supports it."""
+        prov = self._provider(provider)
+        if prov is None:
+            return {}
+        return prov.get_instances(instance_ids)
 
     def refresh_instance(self, instance: Instance) -> Optional[Instance]:
         """Refresh instance status from provider."""
@@ -168,27 +263,24 @@ class GPUInstanceManager:
 
     def set_ssh_key(self, provider: str, instance_id: str, ssh_key_path: str):
         """Set the SSH key path for an instance (for local tracking)."""
-        instances = self._load_local_instances()
-        key = f"{provider}:{instance_id}"
-        if key in instances:
-            instances[key]["ssh_key_path"] = ssh_key_path
-            with open(self._instances_file, "w") as f:
-                json.dump(instances, f, indent=2)
+        db = self._db()
+        with self._db_lock:
+            db.execute(
+                "UPDATE instances SET ssh_key_path = ? WHERE provider = ? AND id = ?",
+                (ssh_key_path, provider, instance_id),
+            )
 
     def get_ssh_command(self, provider: str, instance_id: str) -> Optional[str]:
         """Get the SSH command for an instance."""
-        # First try to get from local cache (has SSH key path)
-        instances = self._load_local_instances()
-        key = f"{provider}:{instance_id}"
-
-        if key in instances:
-            data = instances[key]
-            if data.get("ip_address"):
-                cmd = f"ssh -p {data.get('ssh_port', 22)}"
-                if data.get("ssh_key_path"):
-                    cmd += f" -i {data['ssh_key_path']}"
-                cmd += f" {data.get('ssh_user', 'root')}@{data['ip_address']}"
-                return cmd
+        # First try to get from local tracking (has SSH key path)
+        data = self._local_instance(provider, instance_id)
+
+        if data and data.get("ip_address"):
+            cmd = f"ssh -p {data.get('ssh_port') or 22}"
+            if data.get("ssh_key_path"):
+                cmd += f" -i {data['ssh_key_path']}"
+            cmd += f" {data.get('ssh_user') or 'root'}@{data['ip_address']}"
+            return cmd
 
         # Otherwise get from provider
         instance = self.get_instance(provider, instance_id)
@@ -211,11 +303,26 @@ class GPUInstanceManager:
             provider: Provider name
             instance_id: Instance ID
             timeout: Maximum seconds to wait
-            poll_interval: Seconds between status checks
+            poll_interval: Maximum seconds between status checks. The first few
+                checks come sooner (1s, 1s, 2s, 5s) so fast-booting instances
+                are detected quickly. Providers with a watch_instance stream
+                are watched instead, falling back to polling if the stream ends
+                early.
         """
         import time
 
         start = time.time()
+        delays = iter(WAIT_FOR_READY_INITIAL_DELAYS)
+
+        # Providers that can stream state changes (CoreWeave) avoid polling
+        prov = self._provider(provider)
+        if prov is not None and hasattr(prov, "watch_instance"):
+            for instance in prov.watch_instance(instance_id, timeout=timeout):
+                if instance.status == InstanceStatus.RUNNING and instance.ip_address:
+                    self._save_instance_locally(instance)
+                    return instance
+                if instance.status == InstanceStatus.ERROR:
+                    return instance
 
         while time.time() - start < timeout:
             instance = self.get_instance(provider, instance_id)
@@ -226,6 +333,48 @@ class GPUInstanceManager:
             if instance and instance.status == InstanceStatus.ERROR:
                 return instance
 
-            time.sleep(poll_interval)
+            delay = min(next(delays, poll_interval), poll_interval)
+            remaining = timeout - (time.time() - start)
+            time.sleep(max(0, min(delay, remaining)))
 
         return self.get_instance(provider, instance_id)
+
+    def wait_for_all_ready(
+        self,
+        provider: str,
+        instance_ids: list[str],
+        timeout: int = 300,
+        poll_interval: int = 10,
+    ) -> dict[str, Instance]:
+        """
+        Wait for several instances on one provider to be ready (running with IP).
+
+        All instances are tracked from one shared list_instances poll rather
+        than a poll per instance. Returns the instances that became ready or
+        errored, keyed by ID; IDs still pending at the timeout are omitted.
+
+        Args:
+            provider: Provider name
+            instance_ids: Instance IDs to wait for
+            timeout: Maximum seconds to wait
+            poll_interval: Maximum seconds between status checks
+        """
+        prov = self._provider(provider)
+        if prov is None:
+            return {}
+
+        pending = set(instance_ids)
+        done = {}
+        for instance in prov.watch_instances(
+            instance_ids, interval=min(3, poll_interval), max_interval=poll_interval, timeout=timeout
+        ):
+            if instance.status == InstanceStatus.RUNNING and instance.ip_address:
+                self._save_instance_locally(instance)
+            elif instance.status != InstanceStatus.ERROR:
+                continue
+            done[instance.id] = instance
+            pending.discard(instance.id)
+            if not pending:
+                break
+
+        return done
@@ -1,25 +1,52 @@
 """
 GPU Cloud Provider implementations.
+
+Provider modules are imported on first use, so code that only touches one
+provider doesn't pay for importing the others.
 """
 
-from .base import BaseProvider
-from .lambda_labs import LambdaLabsProvider
-from .runpod import RunPodProvider
-from .vastai import VastAIProvider
-from .coreweave import CoreWeaveProvider
-
-PROVIDERS = {
-    "lambda": LambdaLabsProvider,
-    "runpod": RunPodProvider,
-    "vastai": VastAIProvider,
-    "coreweave": CoreWeaveProvider,
+import importlib
+from functools import lru_cache
+
+from .base import BaseProvider, CircuitBreaker, OutOfCapacity, ProviderUnavailable
+
+# Provider name -> "module:ClassName", resolved lazily by get_provider_class
+PROVIDER_SPECS = {
+    "lambda": "ags.gpu_infra.providers.lambda_labs:LambdaLabsProvider",
+    "runpod": "ags.gpu_infra.providers.runpod:RunPodProvider",
+    "vastai": "ags.gpu_infra.providers.vastai:VastAIProvider",
+    "coreweave": "ags.gpu_infra.providers.coreweave:CoreWeaveProvider",
 }
 
+_CLASS_TO_PROVIDER = {spec.split(":")[1]: name for name, spec in PROVIDER_SPECS.items()}
+
+
+@lru_cache(maxsize=None)
+def get_provider_class(name: str) -> type[BaseProvider]:
+    """Import and return the provider class registered under `name`."""
+    module_name, class_name = PROVIDER_SPECS[name].split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def __getattr__(attr: str):
+    # Keep `from .providers import LambdaLabsProvider` and PROVIDERS working
+    if attr in _CLASS_TO_PROVIDER:
+        return get_provider_class(_CLASS_TO_PROVIDER[attr])
+    if attr == "PROVIDERS":
+        return {name: get_provider_class(name) for name in PROVIDER_SPECS}
+    raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
+
+
 __all__ = [
     "BaseProvider",
+    "CircuitBreaker",
+    "OutOfCapacity",
+    "ProviderUnavailable",
     "LambdaLabsProvider",
     "RunPodProvider",
     "VastAIProvider",
     "CoreWeaveProvider",
     "PROVIDERS",
+    "PROVIDER_SPECS",
+    "get_provider_class",
 ]
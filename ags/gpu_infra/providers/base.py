@@ -3,17 +3,367 @@ Base provider class for GPU cloud providers.
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Hashable, Iterator, Optional
+import copy
 import os
+import json
+import random
+import threading
+import time
+import uuid
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib json module is used without it
+    orjson = None
 
 from ..types import Instance, GPUType, ProviderInfo, InstanceStatus
 
 
+# Retry policy for provider API calls: transient failures only, with jittered backoff
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 1.0
+RETRY_BACKOFF_MAX = 30.0
+RETRY_JITTER = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# (connect, read) seconds: fail fast on unreachable hosts, allow slow launch calls
+REQUEST_TIMEOUT = (3.05, 20)
+
+# Default lifetime of cached API lookups such as GPU availability
+DEFAULT_CACHE_TTL = 30.0
+
+# Bulkhead: each provider instance allows this many requests in flight, and a
+# caller waits at most BULKHEAD_WAIT seconds for a slot before giving up
+MAX_CONCURRENT_REQUESTS = 10
+BULKHEAD_WAIT = 30.0
+
+
+def json_loads(data):
+    """Decode a JSON document from bytes or str, using orjson when installed.
+
+    Decode errors are raised as requests.JSONDecodeError, as resp.json()
+    does, so callers catching requests.RequestException still handle an
+    HTML error page or a truncated body.
+    """
+    try:
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+    except ValueError as e:
+        doc = getattr(e, "doc", None) or data
+        if isinstance(doc, (bytes, bytearray)):
+            doc = doc.decode("utf-8", "replace")
+        raise requests.JSONDecodeError(getattr(e, "msg", str(e)), doc, getattr(e, "pos", 0)) from e
+
+
+def json_dumps(obj) -> bytes:
+    """Encode an object as compact JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def idempotency_headers(key: Optional[str] = None) -> dict:
+    """
+    Idempotency-Key header for a create request.
+
+    Create requests are never resent by the transport (see
+    _create_retry_policy), and none of the providers document honoring this
+    header, so it is advisory only. Callers that retry a whole
+    create_instance call should still pass the same `key` each time.
+    """
+    return {"Idempotency-Key": key or uuid.uuid4().hex}
+
+
+def run_in_daemon(func, *args) -> Future:
+    """
+    Run func(*args) on a daemon thread and return a Future for its result.
+
+    Unlike ThreadPoolExecutor workers, which are joined at interpreter exit
+    even after shutdown(wait=False), a daemon thread stuck in a call can't
+    keep the process alive once the caller has given up on it.
+    """
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(func(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+
+class _JitteredRetry(Retry):
+    """urllib3 Retry whose exponential backoff is spread by +/- RETRY_JITTER."""
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        return min(RETRY_BACKOFF_MAX, backoff * random.uniform(1 - RETRY_JITTER, 1 + RETRY_JITTER))
+
+
+def _retry_policy() -> Retry:
+    return _JitteredRetry(
+        total=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "PUT", "DELETE", "POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,  # hand the last response back so callers can inspect it
+    )
+
+
+def _create_retry_policy() -> Retry:
+    """Retry policy for requests that create billable resources.
+
+    Only connection failures are retried, because those never reached the
+    server. A read timeout or 5xx may follow a create that succeeded, and
+    resending it could provision a second instance, so those surface to the
+    caller to retry explicitly.
+    """
+    return _JitteredRetry(
+        total=RETRY_TOTAL,
+        connect=RETRY_TOTAL,
+        read=0,
+        status=0,
+        other=0,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        allowed_methods=None,
+        raise_on_status=False,
+    )
+
+
+class TTLCache:
+    """Thread-safe {key: (expiry, value)} cache whose entries expire after `ttl` seconds."""
+
+    _MISSING = object()
+
+    def __init__(self, ttl: float = DEFAULT_CACHE_TTL):
+        self.ttl = ttl
+        self._data: dict[Hashable, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            expiry, value = self._data.get(key, (0.0, self._MISSING))
+            if value is self._MISSING or time.monotonic() >= expiry:
+                self._data.pop(key, None)
+                return default
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def pop(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class ProviderUnavailable(requests.RequestException):
+    """Raised without a network call when a provider can't take the request.
+
+    That is, while its circuit breaker is open or its bulkhead stays full.
+    """
+
+
+class OutOfCapacity(RuntimeError):
+    """Raised before a create call when the provider reports no capacity for the request."""
+
+
+class CircuitBreaker:
+    """
+    Fail fast after repeated provider failures.
+
+    CLOSED lets every call through. After `failure_threshold` consecutive
+    failures the breaker OPENs and rejects calls for `recovery_timeout`
+    seconds, then goes HALF_OPEN and lets a single probe through: success
+    closes it, failure re-opens it with the cooldown doubled. A probe that
+    reports neither within `probe_timeout` seconds is treated as lost, and
+    the next caller becomes the probe.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        max_timeout: float = 300.0,
+        probe_timeout: float = 120.0,
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.max_timeout = max_timeout
+        self.probe_timeout = probe_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._cooldown = recovery_timeout
+        self._opened_at = 0.0
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return True if a call may proceed."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            now = time.monotonic()
+            if (
+                (self.state == self.OPEN and now - self._opened_at >= self._cooldown)
+                or (self.state == self.HALF_OPEN and now - self._probe_started >= self.probe_timeout)
+            ):
+                self.state = self.HALF_OPEN
+                self._probe_started = now
+                return True  # this caller is the probe
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._cooldown = self.recovery_timeout
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN:
+                self._cooldown = min(self.max_timeout, self._cooldown * 2)
+            elif self._failures < self.failure_threshold:
+                return
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+
 class BaseProvider(ABC):
-    """Abstract base class for GPU cloud providers."""
+    """Abstract base class for GPU cloud providers.
+
+    Each provider instance is an isolation boundary: it owns its connection
+    pool, concurrency limit and circuit breaker, so a slow or failing
+    provider can't exhaust resources the others need.
+    """
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Providers with a static _INFO get an O(1) price lookup; first tier per GPU wins
+        info = cls.__dict__.get("_INFO")
+        if info is not None:
+            by_gpu = {}
+            for tier in info.pricing:
+                by_gpu.setdefault(tier.gpu_type, tier.hourly_cost)
+            cls._PRICING_BY_GPU = by_gpu
+
+    def __init__(self, api_key: Optional[str] = None, cache_ttl: float = DEFAULT_CACHE_TTL):
         self.api_key = api_key or self._get_api_key_from_env()
+        self._cache = TTLCache(cache_ttl)
+        # One pooled session per provider so API calls reuse keep-alive connections
+        self._session = requests.Session()
+        self._session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=8, pool_maxsize=MAX_CONCURRENT_REQUESTS, max_retries=_retry_policy()
+            ),
+        )
+        if self.api_key:
+            self._session.headers.update(self._headers())
+        # Create calls go over a second pool that never resends a request the
+        # server may have acted on; it shares the main session's headers
+        self._create_session = requests.Session()
+        self._create_session.headers = self._session.headers
+        self._create_session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=1, pool_maxsize=MAX_CONCURRENT_REQUESTS, max_retries=_create_retry_policy()),
+        )
+        self._breaker = CircuitBreaker()
+        self._bulkhead = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+        self._etags: dict[str, tuple[str, Any]] = {}  # url -> (ETag, parsed body)
+
+    def _request(self, method: str, url: str, creates: bool = False, **kwargs) -> requests.Response:
+        """
+        Send an API request over the pooled session, retrying transient failures.
+
+        Pass creates=True for requests that provision resources: those are
+        only retried on connection errors (see _create_retry_policy).
+
+        Raises ProviderUnavailable without touching the network while the
+        provider's circuit breaker is open, or if no bulkhead slot frees up
+        within BULKHEAD_WAIT seconds.
+        """
+        # Take the slot before the breaker so a caller chosen as the HALF_OPEN
+        # probe always gets to send it and report back
+        if not self._bulkhead.acquire(timeout=BULKHEAD_WAIT):
+            raise ProviderUnavailable(f"{type(self).__name__} is saturated; no request slot free")
+        try:
+            if not self._breaker.allow():
+                raise ProviderUnavailable(f"{type(self).__name__} is unavailable; circuit breaker open")
+            kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+            try:
+                session = self._create_session if creates else self._session
+                resp = session.request(method, url, **kwargs)
+            except requests.RequestException:
+                self._breaker.record_failure()
+                raise
+        finally:
+            self._bulkhead.release()
+        if resp.status_code >= 500 or resp.status_code == 408:
+            self._breaker.record_failure()
+        else:
+            self._breaker.record_success()
+        return resp
+
+    def _get_json(self, url: str) -> Any:
+        """
+        GET a JSON document, revalidating with If-None-Match.
+
+        When the provider sent an ETag for `url` last time, a 304 reply reuses
+        the previously parsed body instead of downloading and decoding it
+        again. Providers that don't send ETags never get the header. Callers
+        get their own copy, so mutating it can't corrupt the cached body.
+        """
+        cached = self._etags.get(url)
+        headers = {"If-None-Match": cached[0]} if cached else None
+        resp = self._request("GET", url, headers=headers)
+        if resp.status_code == 304 and cached:
+            return copy.deepcopy(cached[1])
+        resp.raise_for_status()
+        data = json_loads(resp.content)
+        etag = resp.headers.get("ETag")
+        if etag:
+            self._etags[url] = (etag, copy.deepcopy(data))
+        return data
+
+    def close(self):
+        """Close the provider's pooled HTTP connections."""
+        self._session.close()
+        self._create_session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def invalidate_cache(self):
+        """Drop cached API lookups so the next call goes to the provider."""
+        self._cache.clear()
+
+    def _headers(self) -> dict:
+        """Default headers sent with every API request (e.g. authorization)."""
+        return {}
 
     @abstractmethod
     def _get_api_key_from_env(self) -> Optional[str]:
@@ -48,18 +398,90 @@ class BaseProvider(ABC):
         """Terminate an instance. Returns True if successful."""
         pass
 
+    def watch_instances(
+        self,
+        instance_ids: list[str],
+        interval: float = 3.0,
+        max_interval: float = 30.0,
+        timeout: Optional[float] = None,
+    ) -> Iterator[Instance]:
+        """
+        Yield a watched instance each time its status or IP address changes.
+
+        Each poll is a single list_instances call shared by every watched ID,
+        instead of one get_instance call per ID. While nothing changes the
+        poll interval doubles up to `max_interval`; any change resets it.
+        Stops after `timeout` seconds if given, otherwise when the caller
+        stops iterating.
+        """
+        watched = set(instance_ids)
+        last_seen: dict[str, tuple] = {}
+        delay = interval
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        while True:
+            changed = False
+            for inst in self.list_instances():
+                state = (inst.status, inst.ip_address)
+                if inst.id in watched and last_seen.get(inst.id) != state:
+                    last_seen[inst.id] = state
+                    changed = True
+                    yield inst
+
+            delay = interval if changed else min(max_interval, delay * 2)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                delay = min(delay, remaining)
+            time.sleep(delay)
+
+    def terminate_instances(self, instance_ids: list[str]) -> dict[str, bool]:
+        """Terminate several instances, returning success per ID.
+
+        The default issues the single-instance calls concurrently; providers
+        with a bulk endpoint override this.
+        """
+        if not instance_ids:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(8, len(instance_ids))) as executor:
+            results = executor.map(self._terminate_quietly, instance_ids)
+            return dict(zip(instance_ids, results))
+
+    def _terminate_quietly(self, instance_id: str) -> bool:
+        try:
+            return self.terminate_instance(instance_id)
+        except Exception:
+            return False
+
     @abstractmethod
     def get_instance(self, instance_id: str) -> Optional[Instance]:
         """Get details of a specific instance."""
         pass
 
+    def get_instances(self, instance_ids: list[str]) -> dict[str, Instance]:
+        """Get several instances, keyed by ID. IDs that aren't found are omitted.
+
+        Providers that can fetch many instances in one request override this.
+        """
+        found = {}
+        for instance_id in instance_ids:
+            inst = self.get_instance(instance_id)
+            if inst:
+                found[instance_id] = inst
+        return found
+
     def get_available_gpus(self) -> list[GPUType]:
         """Get list of available GPU types from this provider."""
         return [tier.gpu_type for tier in self.info.pricing]
 
     def get_pricing(self, gpu_type: GPUType) -> Optional[float]:
         """Get hourly price for a GPU type."""
+        by_gpu = self.__class__.__dict__.get("_PRICING_BY_GPU")
+        if by_gpu is not None:
+            return by_gpu.get(gpu_type)
+        # Enum members are singletons, so identity is the cheapest exact match
         for tier in self.info.pricing:
-            if tier.gpu_type == gpu_type:
+            if tier.gpu_type is gpu_type:
                 return tier.hourly_cost
         return None
@@ -3,14 +3,28 @@ CoreWeave GPU Cloud provider implementation.
 
 Note: CoreWeave uses Kubernetes for instance management.
 This is a simplified implementation for basic operations.
+
+When the `kubernetes` package is installed, pods are managed through a shared
+API client that keeps its HTTPS connection open; otherwise each operation
+shells out to kubectl.
 """
 
+import copy
 import os
 import subprocess
 import json
-from typing import Optional
-
-from .base import BaseProvider
+import threading
+import time
+from typing import Iterator, Optional
+
+try:
+    from kubernetes import client as k8s_client, config as k8s_config, watch as k8s_watch
+except ImportError:  # optional; fall back to kubectl
+    k8s_client = None
+    k8s_config = None
+    k8s_watch = None
+
+from .base import DEFAULT_CACHE_TTL, BaseProvider, json_loads
 from ..types import Instance, GPUType, ProviderInfo, PricingTier, InstanceStatus
 
 
@@ -18,32 +32,48 @@ class CoreWeaveProvider(BaseProvider):
     """CoreWeave GPU Cloud provider (Kubernetes-based)."""
 
     API_BASE = "https://api.coreweave.com"
-
-    def __init__(self, api_key: Optional[str] = None, kubeconfig: Optional[str] = None):
-        super().__init__(api_key)
+    LIST_CACHE_TTL = 1.5  # seconds; absorbs concurrent wait_for_ready polling
+    KUBE_TIMEOUT = 30  # seconds; bounds each API call / kubectl run
+
+    # Static catalog info, built once at class creation rather than per access
+    _INFO = ProviderInfo(
+        name="CoreWeave",
+        api_base_url=API_BASE,
+        pricing=[
+            PricingTier(gpu_type=GPUType.A100_80GB, hourly_cost=2.21, vcpus=16, ram_gb=128, storage_gb=256),
+            PricingTier(gpu_type=GPUType.A100_40GB, hourly_cost=2.06, vcpus=16, ram_gb=128, storage_gb=256),
+            PricingTier(gpu_type=GPUType.H100, hourly_cost=4.76, vcpus=24, ram_gb=180, storage_gb=256),
+            PricingTier(gpu_type=GPUType.A10, hourly_cost=0.75, vcpus=8, ram_gb=32, storage_gb=128),
+            PricingTier(gpu_type=GPUType.RTX_4090, hourly_cost=1.24, vcpus=8, ram_gb=32, storage_gb=128),
+        ],
+        reliability_score=95.0,
+        regions=["ORD1", "LAS1", "LGA1"],
+        supports_spot=True,
+        min_billing_increment=60,
+        notes="Enterprise-grade, best reliability. Uses Kubernetes. Higher prices but excellent support.",
+    )
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        kubeconfig: Optional[str] = None,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+    ):
+        super().__init__(api_key, cache_ttl)
         self.kubeconfig = kubeconfig or os.environ.get("COREWEAVE_KUBECONFIG")
+        self._core_v1 = None
+        self._namespace = "default"
+        self._k8s_unavailable = k8s_client is None
+        self._list_cache: Optional[list[Instance]] = None
+        self._list_cache_ts = 0.0
+        self._list_lock = threading.Lock()
 
     def _get_api_key_from_env(self) -> Optional[str]:
         return os.environ.get("COREWEAVE_API_KEY")
 
     @property
     def info(self) -> ProviderInfo:
-        return ProviderInfo(
-            name="CoreWeave",
-            api_base_url=self.API_BASE,
-            pricing=[
-                PricingTier(gpu_type=GPUType.A100_80GB, hourly_cost=2.21, vcpus=16, ram_gb=128, storage_gb=256),
-                PricingTier(gpu_type=GPUType.A100_40GB, hourly_cost=2.06, vcpus=16, ram_gb=128, storage_gb=256),
-                PricingTier(gpu_type=GPUType.H100, hourly_cost=4.76, vcpus=24, ram_gb=180, storage_gb=256),
-                PricingTier(gpu_type=GPUType.A10, hourly_cost=0.75, vcpus=8, ram_gb=32, storage_gb=128),
-                PricingTier(gpu_type=GPUType.RTX_4090, hourly_cost=1.24, vcpus=8, ram_gb=32, storage_gb=128),
-            ],
-            reliability_score=95.0,
-            regions=["ORD1", "LAS1", "LGA1"],
-            supports_spot=True,
-            min_billing_increment=60,
-            notes="Enterprise-grade, best reliability. Uses Kubernetes. Higher prices but excellent support.",
-        )
+        return self._INFO
 
     def _kubectl(self, args: list[str]) -> tuple[int, str, str]:
         """Execute kubectl command."""
@@ -53,22 +83,46 @@ class CoreWeaveProvider(BaseProvider):
         cmd.extend(args)
 
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.KUBE_TIMEOUT)
             return result.returncode, result.stdout, result.stderr
         except subprocess.TimeoutExpired:
             return 1, "", "Command timed out"
         except FileNotFoundError:
             return 1, "", "kubectl not found"
 
+    def _k8s(self):
+        """Get the shared CoreV1Api client, or None to fall back to kubectl."""
+        if self._core_v1 is None and not self._k8s_unavailable:
+            try:
+                api_client = k8s_config.new_client_from_config(config_file=self.kubeconfig)
+                _, active = k8s_config.list_kube_config_contexts(config_file=self.kubeconfig)
+                self._namespace = active.get("context", {}).get("namespace", "default")
+                self._core_v1 = k8s_client.CoreV1Api(api_client)
+            except Exception:
+                self._k8s_unavailable = True
+        return self._core_v1
+
+    def _pod_to_dict(self, api, pod) -> dict:
+        """Convert a client model to the same camelCase dict kubectl -o json emits."""
+        return api.api_client.sanitize_for_serialization(pod)
+
+    _GPU_RESOURCES = {
+        GPUType.A100_40GB: "A100_PCIE_40GB",
+        GPUType.A100_80GB: "A100_NVLINK_80GB",
+        GPUType.H100: "H100_NVLINK_80GB",
+        GPUType.A10: "A10",
+        GPUType.RTX_4090: "RTX_4090",
+    }
+
     def _gpu_type_to_resource(self, gpu_type: GPUType) -> str:
-        mapping = {
-            GPUType.A100_40GB: "A100_PCIE_40GB",
-            GPUType.A100_80GB: "A100_NVLINK_80GB",
-            GPUType.H100: "H100_NVLINK_80GB",
-            GPUType.A10: "A10",
-            GPUType.RTX_4090: "RTX_4090",
-        }
-        return mapping.get(gpu_type, "A100_PCIE_40GB")
+        return self._GPU_RESOURCES.get(gpu_type, "A100_PCIE_40GB")
+
+    _STATUS_MAP = {
+        "running": InstanceStatus.RUNNING,
+        "pending": InstanceStatus.PENDING,
+        "succeeded": InstanceStatus.STOPPED,
+        "failed": InstanceStatus.ERROR,
+    }
 
     def _parse_pod(self, pod: dict) -> Instance:
         metadata = pod.get("metadata", {})
@@ -91,19 +145,13 @@ class CoreWeaveProvider(BaseProvider):
                 break
 
         phase = status.get("phase", "").lower()
-        status_map = {
-            "running": InstanceStatus.RUNNING,
-            "pending": InstanceStatus.PENDING,
-            "succeeded": InstanceStatus.STOPPED,
-            "failed": InstanceStatus.ERROR,
-        }
 
         return Instance(
             id=metadata.get("name", ""),
             provider="coreweave",
             gpu_type=gpu_type,
             gpu_count=1,
-            status=status_map.get(phase, InstanceStatus.RUNNING),
+            status=self._STATUS_MAP.get(phase, InstanceStatus.RUNNING),
             ip_address=status.get("podIP"),
             ssh_port=22,
             ssh_user="root",
@@ -111,21 +159,55 @@ class CoreWeaveProvider(BaseProvider):
             metadata=pod,
         )
 
-    def list_instances(self) -> list[Instance]:
-        if not self.kubeconfig:
-            return []
+    def _fetch_instances(self) -> Optional[list[Instance]]:
+        """List GPU workload pods from the cluster. Returns None on failure."""
+        api = self._k8s()
+        if api is not None:
+            try:
+                pods = api.list_namespaced_pod(
+                    self._namespace, label_selector="gpu-workload=true", _request_timeout=self.KUBE_TIMEOUT
+                )
+                return [self._parse_pod(pod) for pod in self._pod_to_dict(api, pods).get("items", [])]
+            except Exception:
+                return None
 
         rc, stdout, _ = self._kubectl(["get", "pods", "-o", "json", "-l", "gpu-workload=true"])
         if rc != 0:
-            return []
+            return None
 
         try:
-            data = json.loads(stdout)
+            data = json_loads(stdout)
             pods = data.get("items", [])
             return [self._parse_pod(pod) for pod in pods]
-        except json.JSONDecodeError:
+        except ValueError:  # any JSON decode error
+            return None
+
+    def _cached_instances(self) -> Optional[list[Instance]]:
+        """Return the cached pod listing if it is younger than LIST_CACHE_TTL."""
+        with self._list_lock:
+            if self._list_cache is not None and time.monotonic() - self._list_cache_ts < self.LIST_CACHE_TTL:
+                return self._list_cache
+        return None
+
+    def _invalidate_list_cache(self):
+        with self._list_lock:
+            self._list_cache = None
+
+    def list_instances(self) -> list[Instance]:
+        if not self.kubeconfig:
             return []
 
+        instances = self._cached_instances()
+        if instances is None:
+            instances = self._fetch_instances()
+            if instances is None:
+                return []
+            with self._list_lock:
+                self._list_cache = instances
+                self._list_cache_ts = time.monotonic()
+
+        return [copy.copy(inst) for inst in instances]
+
     def create_instance(
         self,
         gpu_type: GPUType,
@@ -137,6 +219,7 @@ class CoreWeaveProvider(BaseProvider):
         if not self.kubeconfig:
             raise ValueError("Kubeconfig required for CoreWeave")
 
+        self._invalidate_list_cache()
         gpu_resource = self._gpu_type_to_resource(gpu_type)
         pod_name = name or f"gpu-workload-{gpu_type.value.replace('_', '-')}"
 
@@ -167,6 +250,20 @@ class CoreWeaveProvider(BaseProvider):
         if region:
             pod_spec["spec"]["nodeSelector"] = {"topology.kubernetes.io/region": region}
 
+        api = self._k8s()
+        if api is not None:
+            try:
+                api.create_namespaced_pod(self._namespace, body=pod_spec, _request_timeout=self.KUBE_TIMEOUT)
+            except Exception as e:
+                # Like `kubectl apply`, an existing pod of that name is returned
+                # as-is rather than treated as a failure
+                if getattr(e, "status", None) != 409:
+                    raise RuntimeError(f"Failed to create pod: {e}")
+            inst = self.get_instance(pod_name)
+            if inst:
+                return inst
+            raise RuntimeError("Pod created but could not retrieve details")
+
         # Write spec to temp file and apply
         import tempfile
 
@@ -190,6 +287,14 @@ class CoreWeaveProvider(BaseProvider):
     def terminate_instance(self, instance_id: str) -> bool:
         if not self.kubeconfig:
             return False
+        self._invalidate_list_cache()
+        api = self._k8s()
+        if api is not None:
+            try:
+                api.delete_namespaced_pod(instance_id, self._namespace, _request_timeout=self.KUBE_TIMEOUT)
+                return True
+            except Exception:
+                return False
         rc, _, _ = self._kubectl(["delete", "pod", instance_id])
         return rc == 0
 
@@ -197,12 +302,86 @@ class CoreWeaveProvider(BaseProvider):
         if not self.kubeconfig:
             return None
 
+        # Serve from a fresh listing so concurrent pollers share one request
+        for inst in self._cached_instances() or ():
+            if inst.id == instance_id:
+                return copy.copy(inst)
+
+        api = self._k8s()
+        if api is not None:
+            try:
+                pod = api.read_namespaced_pod(instance_id, self._namespace, _request_timeout=self.KUBE_TIMEOUT)
+                return self._parse_pod(self._pod_to_dict(api, pod))
+            except Exception:
+                return None
+
         rc, stdout, _ = self._kubectl(["get", "pod", instance_id, "-o", "json"])
         if rc != 0:
             return None
 
         try:
-            pod = json.loads(stdout)
+            pod = json_loads(stdout)
             return self._parse_pod(pod)
-        except json.JSONDecodeError:
+        except ValueError:  # any JSON decode error
             return None
+
+    def watch_instance(self, instance_id: str, timeout: float = 300) -> Iterator[Instance]:
+        """
+        Yield the pod's state each time it changes, for up to `timeout` seconds.
+
+        Uses one watch stream instead of repeated gets: the Kubernetes API when
+        available, otherwise a single `kubectl get pod --watch` process.
+        """
+        if not self.kubeconfig:
+            return
+
+        api = self._k8s()
+        if api is not None:
+            watcher = k8s_watch.Watch()
+            try:
+                for event in watcher.stream(
+                    api.list_namespaced_pod,
+                    self._namespace,
+                    field_selector=f"metadata.name={instance_id}",
+                    timeout_seconds=int(timeout),
+                    # Events can be sparse, so only the connect is held to KUBE_TIMEOUT
+                    _request_timeout=(self.KUBE_TIMEOUT, timeout + self.KUBE_TIMEOUT),
+                ):
+                    yield self._parse_pod(self._pod_to_dict(api, event["object"]))
+            except Exception:
+                return
+            finally:
+                watcher.stop()
+            return
+
+        cmd = [
+            "kubectl", "--kubeconfig", self.kubeconfig,
+            "get", "pod", instance_id, "--watch", "-o", "json", "--output-watch-events=true",
+        ]
+
+        try:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        except FileNotFoundError:
+            return
+
+        timer = threading.Timer(timeout, proc.kill)
+        timer.start()
+        try:
+            # kubectl pretty-prints each event; an object ends with a bare "}" line
+            lines = []
+            for line in proc.stdout:
+                lines.append(line)
+                if line.rstrip("\n") != "}":
+                    continue
+                text = "".join(lines)
+                # Reset even on a decode error so a stray line can't poison later events
+                lines = []
+                try:
+                    event = json_loads(text)
+                except ValueError:  # any JSON decode error
+                    continue
+                yield self._parse_pod(event.get("object", event))
+        finally:
+            timer.cancel()
+            proc.kill()
+            proc.wait()
@@ -7,7 +7,7 @@ import requests
 from typing import Optional
 from datetime import datetime
 
-from .base import BaseProvider
+from .base import BaseProvider, OutOfCapacity, ProviderUnavailable, idempotency_headers, json_loads
 from ..types import Instance, GPUType, ProviderInfo, PricingTier, InstanceStatus
 
 
@@ -16,62 +16,68 @@ class LambdaLabsProvider(BaseProvider):
 
     API_BASE = "https://cloud.lambdalabs.com/api/v1"
 
+    # Static catalog info, built once at class creation rather than per access
+    _INFO = ProviderInfo(
+        name="Lambda Labs",
+        api_base_url=API_BASE,
+        pricing=[
+            PricingTier(gpu_type=GPUType.A100_40GB, hourly_cost=1.10, vcpus=30, ram_gb=200, storage_gb=512),
+            PricingTier(gpu_type=GPUType.A100_80GB, hourly_cost=1.29, vcpus=30, ram_gb=200, storage_gb=512),
+            PricingTier(gpu_type=GPUType.H100, hourly_cost=2.49, vcpus=26, ram_gb=200, storage_gb=512),
+            PricingTier(gpu_type=GPUType.A10, hourly_cost=0.60, vcpus=30, ram_gb=200, storage_gb=512),
+        ],
+        reliability_score=92.0,
+        regions=["us-west-1", "us-east-1", "us-south-1", "europe-central-1"],
+        supports_spot=False,
+        min_billing_increment=60,
+        notes="High reliability, good for production workloads. Often has availability issues for A100s.",
+    )
+
     def _get_api_key_from_env(self) -> Optional[str]:
         return os.environ.get("LAMBDA_API_KEY")
 
     @property
     def info(self) -> ProviderInfo:
-        return ProviderInfo(
-            name="Lambda Labs",
-            api_base_url=self.API_BASE,
-            pricing=[
-                PricingTier(gpu_type=GPUType.A100_40GB, hourly_cost=1.10, vcpus=30, ram_gb=200, storage_gb=512),
-                PricingTier(gpu_type=GPUType.A100_80GB, hourly_cost=1.29, vcpus=30, ram_gb=200, storage_gb=512),
-                PricingTier(gpu_type=GPUType.H100, hourly_cost=2.49, vcpus=26, ram_gb=200, storage_gb=512),
-                PricingTier(gpu_type=GPUType.A10, hourly_cost=0.60, vcpus=30, ram_gb=200, storage_gb=512),
-            ],
-            reliability_score=92.0,
-            regions=["us-west-1", "us-east-1", "us-south-1", "europe-central-1"],
-            supports_spot=False,
-            min_billing_increment=60,
-            notes="High reliability, good for production workloads. Often has availability issues for A100s.",
-        )
+        return self._INFO
 
     def _headers(self) -> dict:
         return {"Authorization": f"Bearer {self.api_key}"}
 
+    _INSTANCE_TYPES = {
+        GPUType.A100_40GB: "gpu_1x_a100",
+        GPUType.A100_80GB: "gpu_1x_a100_sxm4",
+        GPUType.H100: "gpu_1x_h100_pcie",
+        GPUType.A10: "gpu_1x_a10",
+    }
+
     def _gpu_type_to_instance_type(self, gpu_type: GPUType) -> str:
-        mapping = {
-            GPUType.A100_40GB: "gpu_1x_a100",
-            GPUType.A100_80GB: "gpu_1x_a100_sxm4",
-            GPUType.H100: "gpu_1x_h100_pcie",
-            GPUType.A10: "gpu_1x_a10",
-        }
-        return mapping.get(gpu_type, "gpu_1x_a100")
+        return self._INSTANCE_TYPES.get(gpu_type, "gpu_1x_a100")
+
+    # First matching substring of the lowercased instance-type name wins
+    _GPU_SUBSTR = (
+        ("a100_sxm4", GPUType.A100_80GB),
+        ("h100", GPUType.H100),
+        ("a10", GPUType.A10),
+    )
+
+    _STATUS_MAP = {
+        "active": InstanceStatus.RUNNING,
+        "booting": InstanceStatus.PENDING,
+        "terminated": InstanceStatus.TERMINATED,
+        "unhealthy": InstanceStatus.ERROR,
+    }
 
     def _parse_instance(self, data: dict) -> Instance:
-        gpu_type = GPUType.A100_40GB  # default
         instance_type = data.get("instance_type", {})
-        if "a100_sxm4" in instance_type.get("name", "").lower():
-            gpu_type = GPUType.A100_80GB
-        elif "h100" in instance_type.get("name", "").lower():
-            gpu_type = GPUType.H100
-        elif "a10" in instance_type.get("name", "").lower():
-            gpu_type = GPUType.A10
-
-        status_map = {
-            "active": InstanceStatus.RUNNING,
-            "booting": InstanceStatus.PENDING,
-            "terminated": InstanceStatus.TERMINATED,
-            "unhealthy": InstanceStatus.ERROR,
-        }
+        name = instance_type.get("name", "").lower()
+        gpu_type = next((g for sub, g in self._GPU_SUBSTR if sub in name), GPUType.A100_40GB)
 
         return Instance(
             id=data["id"],
             provider="lambda",
             gpu_type=gpu_type,
             gpu_count=instance_type.get("specs", {}).get("gpus", 1),
-            status=status_map.get(data.get("status", ""), InstanceStatus.RUNNING),
+            status=self._STATUS_MAP.get(data.get("status", ""), InstanceStatus.RUNNING),
             ip_address=data.get("ip"),
             ssh_port=22,
             ssh_user="ubuntu",
@@ -83,9 +89,10 @@ class LambdaLabsProvider(BaseProvider):
     def list_instances(self) -> list[Instance]:
         if not self.api_key:
             return []
-        resp = requests.get(f"{self.API_BASE}/instances", headers=self._headers())
-        resp.raise_for_status()
-        data = resp.json().get("data", [])
+        try:
+            data = self._get_json(f"{self.API_BASE}/instances").get("data", [])
+        except ProviderUnavailable:
+            return []
         return [self._parse_instance(inst) for inst in data]
 
     def create_instance(
@@ -95,6 +102,7 @@ class LambdaLabsProvider(BaseProvider):
         region: Optional[str] = None,
         ssh_key_name: Optional[str] = None,
         name: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
     ) -> Instance:
         if not self.api_key:
             raise ValueError("API key required to create instance")
@@ -102,23 +110,29 @@ class LambdaLabsProvider(BaseProvider):
         instance_type = self._gpu_type_to_instance_type(gpu_type)
         if gpu_count > 1:
             instance_type = instance_type.replace("1x", f"{gpu_count}x")
+        region = region or "us-west-1"
+
+        if not self._has_capacity(instance_type, region):
+            raise OutOfCapacity(f"Lambda Labs has no {instance_type} capacity in {region}")
 
         payload = {
             "instance_type_name": instance_type,
-            "region_name": region or "us-west-1",
+            "region_name": region,
             "ssh_key_names": [ssh_key_name] if ssh_key_name else [],
             "quantity": 1,
         }
         if name:
             payload["name"] = name
 
-        resp = requests.post(
+        resp = self._request(
+            "POST",
             f"{self.API_BASE}/instance-operations/launch",
-            headers=self._headers(),
+            creates=True,
             json=payload,
+            headers=idempotency_headers(idempotency_key),
         )
         resp.raise_for_status()
-        instance_ids = resp.json().get("data", {}).get("instance_ids", [])
+        instance_ids = json_loads(resp.content).get("data", {}).get("instance_ids", [])
         if not instance_ids:
             raise RuntimeError("No instance ID returned")
 
@@ -131,34 +145,87 @@ class LambdaLabsProvider(BaseProvider):
     def terminate_instance(self, instance_id: str) -> bool:
         if not self.api_key:
             return False
-        resp = requests.post(
+        resp = self._request(
+            "POST",
             f"{self.API_BASE}/instance-operations/terminate",
-            headers=self._headers(),
             json={"instance_ids": [instance_id]},
         )
         return resp.status_code == 200
 
+    def terminate_instances(self, instance_ids: list[str]) -> dict[str, bool]:
+        """Terminate several instances with one call to the bulk terminate endpoint."""
+        if not self.api_key or not instance_ids:
+            return {instance_id: False for instance_id in instance_ids}
+        try:
+            resp = self._request(
+                "POST",
+                f"{self.API_BASE}/instance-operations/terminate",
+                json={"instance_ids": list(instance_ids)},
+            )
+        except requests.RequestException:
+            return {instance_id: False for instance_id in instance_ids}
+        if resp.status_code != 200:
+            return {instance_id: False for instance_id in instance_ids}
+        terminated = json_loads(resp.content).get("data", {}).get("terminated_instances", [])
+        terminated_ids = {inst.get("id") for inst in terminated}
+        return {instance_id: instance_id in terminated_ids for instance_id in instance_ids}
+
     def get_instance(self, instance_id: str) -> Optional[Instance]:
         if not self.api_key:
             return None
-        resp = requests.get(f"{self.API_BASE}/instances/{instance_id}", headers=self._headers())
+        resp = self._request("GET", f"{self.API_BASE}/instances/{instance_id}")
         if resp.status_code != 200:
             return None
-        data = resp.json().get("data")
+        data = json_loads(resp.content).get("data")
         if data:
             return self._parse_instance(data)
         return None
 
-    def check_availability(self, gpu_type: GPUType, region: Optional[str] = None) -> bool:
-        """Check if a GPU type is currently available."""
+    def _regions_with_capacity(self) -> dict[str, frozenset]:
+        """Map each instance type to the region names that currently have capacity.
+
+        One /instance-types response answers every availability query, so the
+        whole map is cached for the provider's cache_ttl (30s by default).
+        """
+        regions = self._cache.get("regions_with_capacity")
+        if regions is None:
+            data = self._get_json(f"{self.API_BASE}/instance-types").get("data", {})
+            regions = {
+                type_id: frozenset(
+                    r.get("name") for r in info.get("regions_with_capacity_available", [])
+                )
+                for type_id, info in data.items()
+            }
+            self._cache.put("regions_with_capacity", regions)
+        return regions
+
+    def _has_capacity(self, instance_type: str, region: str) -> bool:
+        """Pre-flight for create_instance using the cached availability map.
+
+        A cached "no" is re-checked against a fresh response before we give up,
+        and if availability can't be fetched the launch is allowed to proceed.
+        """
+        try:
+            if region in self._regions_with_capacity().get(instance_type, frozenset()):
+                return True
+            self._cache.pop("regions_with_capacity")
+            return region in self._regions_with_capacity().get(instance_type, frozenset())
+        except requests.RequestException:
+            return True
+
+    def check_availability(
+        self, gpu_type: GPUType, region: Optional[str] = None, refresh: bool = False
+    ) -> bool:
+        """Check if a GPU type is currently available.
+
+        Answers come from a snapshot up to cache_ttl seconds old; pass
+        refresh=True to fetch a new one.
+        """
         if not self.api_key:
             return False
-        resp = requests.get(f"{self.API_BASE}/instance-types", headers=self._headers())
-        resp.raise_for_status()
-        data = resp.json().get("data", {})
-        instance_type = self._gpu_type_to_instance_type(gpu_type)
-        type_info = data.get(instance_type, {})
-        regions = type_info.get("regions_with_capacity_available", [])
+        if refresh:
+            self._cache.pop("regions_with_capacity")
+        names = self._regions_with_capacity().get(self._gpu_type_to_instance_type(gpu_type), frozenset())
         if region:
-            return any(r.get("name") == region for r in regions)
-        return len(regions) > 0
+            return region in names
+        return bool(names)
@@ -6,7 +6,7 @@ import os
 import requests
 from typing import Optional
 
-from .base import BaseProvider
+from .base import BaseProvider, idempotency_headers, json_dumps, json_loads
 from ..types import Instance, GPUType, ProviderInfo, PricingTier, InstanceStatus
 
 
@@ -15,68 +15,83 @@ class RunPodProvider(BaseProvider):
 
     API_BASE = "https://api.runpod.io/graphql"
 
+    # Static catalog info, built once at class creation rather than per access
+    _INFO = ProviderInfo(
+        name="RunPod",
+        api_base_url=API_BASE,
+        pricing=[
+            PricingTier(gpu_type=GPUType.A100_80GB, hourly_cost=1.89, spot_cost=0.89, vcpus=16, ram_gb=125, storage_gb=100),
+            PricingTier(gpu_type=GPUType.A100_40GB, hourly_cost=1.64, spot_cost=0.79, vcpus=16, ram_gb=125, storage_gb=100),
+            PricingTier(gpu_type=GPUType.H100, hourly_cost=3.89, spot_cost=2.39, vcpus=20, ram_gb=200, storage_gb=100),
+            PricingTier(gpu_type=GPUType.RTX_4090, hourly_cost=0.74, spot_cost=0.34, vcpus=16, ram_gb=62, storage_gb=100),
+            PricingTier(gpu_type=GPUType.RTX_3090, hourly_cost=0.44, spot_cost=0.19, vcpus=16, ram_gb=62, storage_gb=100),
+        ],
+        reliability_score=85.0,
+        regions=["US", "EU", "CA"],
+        supports_spot=True,
+        min_billing_increment=1,  # Per-second billing
+        notes="Great spot prices, community cloud option. Good for experimentation.",
+    )
+
     def _get_api_key_from_env(self) -> Optional[str]:
         return os.environ.get("RUNPOD_API_KEY")
 
     @property
     def info(self) -> ProviderInfo:
-        return ProviderInfo(
-            name="RunPod",
-            api_base_url=self.API_BASE,
-            pricing=[
-                PricingTier(gpu_type=GPUType.A100_80GB, hourly_cost=1.89, spot_cost=0.89, vcpus=16, ram_gb=125, storage_gb=100),
-                PricingTier(gpu_type=GPUType.A100_40GB, hourly_cost=1.64, spot_cost=0.79, vcpus=16, ram_gb=125, storage_gb=100),
-                PricingTier(gpu_type=GPUType.H100, hourly_cost=3.89, spot_cost=2.39, vcpus=20, ram_gb=200, storage_gb=100),
-                PricingTier(gpu_type=GPUType.RTX_4090, hourly_cost=0.74, spot_cost=0.34, vcpus=16, ram_gb=62, storage_gb=100),
-                PricingTier(gpu_type=GPUType.RTX_3090, hourly_cost=0.44, spot_cost=0.19, vcpus=16, ram_gb=62, storage_gb=100),
-            ],
-            reliability_score=85.0,
-            regions=["US", "EU", "CA"],
-            supports_spot=True,
-            min_billing_increment=1,  # Per-second billing
-            notes="Great spot prices, community cloud option. Good for experimentation.",
-        )
+        return self._INFO
 
     def _headers(self) -> dict:
         return {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
 
+    _GPU_TYPE_IDS = {
+        GPUType.A100_40GB: "NVIDIA A100 40GB",
+        GPUType.A100_80GB: "NVIDIA A100 80GB",
+        GPUType.H100: "NVIDIA H100 80GB HBM3",
+        GPUType.RTX_4090: "NVIDIA GeForce RTX 4090",
+        GPUType.RTX_3090: "NVIDIA GeForce RTX 3090",
+    }
+
     def _gpu_type_to_id(self, gpu_type: GPUType) -> str:
-        mapping = {
-            GPUType.A100_40GB: "NVIDIA A100 40GB",
-            GPUType.A100_80GB: "NVIDIA A100 80GB",
-            GPUType.H100: "NVIDIA H100 80GB HBM3",
-            GPUType.RTX_4090: "NVIDIA GeForce RTX 4090",
-            GPUType.RTX_3090: "NVIDIA GeForce RTX 3090",
-        }
-        return mapping.get(gpu_type, "NVIDIA A100 40GB")
+        return self._GPU_TYPE_IDS.get(gpu_type, "NVIDIA A100 40GB")
 
-    def _graphql_request(self, query: str, variables: Optional[dict] = None) -> dict:
+    def _graphql_request(
+        self,
+        query: str,
+        variables: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        creates: bool = False,
+    ) -> dict:
         if not self.api_key:
             raise ValueError("API key required")
         payload = {"query": query}
         if variables:
             payload["variables"] = variables
-        resp = requests.post(self.API_BASE, headers=self._headers(), json=payload)
+        resp = self._request(
+            "POST", self.API_BASE, creates=creates, data=json_dumps(payload), headers=headers
+        )
         resp.raise_for_status()
-        return resp.json()
+        return json_loads(resp.content)
+
+    # First entry whose substrings all appear in the GPU display name wins
+    _GPU_SUBSTR = (
+        (("80GB", "A100"), GPUType.A100_80GB),
+        (("H100",), GPUType.H100),
+        (("4090",), GPUType.RTX_4090),
+        (("3090",), GPUType.RTX_3090),
+    )
+
+    _STATUS_MAP = {
+        "RUNNING": InstanceStatus.RUNNING,
+        "CREATED": InstanceStatus.PENDING,
+        "EXITED": InstanceStatus.STOPPED,
+    }
 
     def _parse_instance(self, data: dict) -> Instance:
         gpu_name = data.get("machine", {}).get("gpuDisplayName", "")
-        gpu_type = GPUType.A100_40GB
-        if "80GB" in gpu_name and "A100" in gpu_name:
-            gpu_type = GPUType.A100_80GB
-        elif "H100" in gpu_name:
-            gpu_type = GPUType.H100
-        elif "4090" in gpu_name:
-            gpu_type = GPUType.RTX_4090
-        elif "3090" in gpu_name:
-            gpu_type = GPUType.RTX_3090
-
-        status_map = {
-            "RUNNING": InstanceStatus.RUNNING,
-            "CREATED": InstanceStatus.PENDING,
-            "EXITED": InstanceStatus.STOPPED,
-        }
+        gpu_type = next(
+            (g for subs, g in self._GPU_SUBSTR if all(sub in gpu_name for sub in subs)),
+            GPUType.A100_40GB,
+        )
 
         runtime = data.get("runtime", {}) or {}
 
@@ -85,7 +100,7 @@ class RunPodProvider(BaseProvider):
             provider="runpod",
             gpu_type=gpu_type,
             gpu_count=data.get("gpuCount", 1),
-            status=status_map.get(data.get("desiredStatus", ""), InstanceStatus.RUNNING),
+            status=self._STATUS_MAP.get(data.get("desiredStatus", ""), InstanceStatus.RUNNING),
             ip_address=runtime.get("gpus", [{}])[0].get("publicIp") if runtime.get("gpus") else None,
             ssh_port=runtime.get("ports", [{}])[0].get("publicPort", 22) if runtime.get("ports") else 22,
             ssh_user="root",
@@ -93,31 +108,38 @@ class RunPodProvider(BaseProvider):
             metadata=data,
         )
 
+    # Pod fields read by _parse_instance, shared by every pod query
+    _POD_FIELDS = """
+    fragment PodFields on Pod {
+        id
+        name
+        desiredStatus
+        gpuCount
+        machine {
+            gpuDisplayName
+        }
+        runtime {
+            gpus {
+                publicIp
+            }
+            ports {
+                publicPort
+                privatePort
+            }
+        }
+    }
+    """
+
     def list_instances(self) -> list[Instance]:
         query = """
         query {
             myself {
                 pods {
-                    id
-                    name
-                    desiredStatus
-                    gpuCount
-                    machine {
-                        gpuDisplayName
-                    }
-                    runtime {
-                        gpus {
-                            publicIp
-                        }
-                        ports {
-                            publicPort
-                            privatePort
-                        }
-                    }
+                    ...PodFields
                 }
             }
         }
-        """
+        """ + self._POD_FIELDS
         try:
             result = self._graphql_request(query)
             pods = result.get("data", {}).get("myself", {}).get("pods", [])
@@ -133,6 +155,7 @@ class RunPodProvider(BaseProvider):
         ssh_key_name: Optional[str] = None,
         name: Optional[str] = None,
         spot: bool = False,
+        idempotency_key: Optional[str] = None,
     ) -> Instance:
         gpu_id = self._gpu_type_to_id(gpu_type)
         cloud_type = "COMMUNITY" if spot else "SECURE"
@@ -166,7 +189,9 @@ class RunPodProvider(BaseProvider):
             }
         }
 
-        result = self._graphql_request(query, variables)
+        result = self._graphql_request(
+            query, variables, headers=idempotency_headers(idempotency_key), creates=True
+        )
         pod = result.get("data", {}).get("podFindAndDeployOnDemand")
         if not pod:
             raise RuntimeError(f"Failed to create instance: {result}")
@@ -188,25 +213,10 @@ class RunPodProvider(BaseProvider):
         query = """
         query ($podId: String!) {
             pod(input: {podId: $podId}) {
-                id
-                name
-                desiredStatus
-                gpuCount
-                machine {
-                    gpuDisplayName
-                }
-                runtime {
-                    gpus {
-                        publicIp
-                    }
-                    ports {
-                        publicPort
-                        privatePort
-                    }
-                }
+                ...PodFields
             }
         }
-        """
+        """ + self._POD_FIELDS
         try:
             result = self._graphql_request(query, {"podId": instance_id})
             pod = result.get("data", {}).get("pod")
@@ -215,3 +225,24 @@ class RunPodProvider(BaseProvider):
         except (ValueError, requests.RequestException):
             pass
         return None
+
+    def get_instances(self, instance_ids: list[str]) -> dict[str, Instance]:
+        """Fetch several pods in one GraphQL request using aliased pod queries."""
+        if not instance_ids:
+            return {}
+        params = ", ".join(f"$p{i}: String!" for i in range(len(instance_ids)))
+        fields = "\n".join(
+            f"p{i}: pod(input: {{podId: $p{i}}}) {{ ...PodFields }}" for i in range(len(instance_ids))
+        )
+        query = f"query ({params}) {{\n{fields}\n}}\n" + self._POD_FIELDS
+        variables = {f"p{i}": instance_id for i, instance_id in enumerate(instance_ids)}
+        try:
+            data = self._graphql_request(query, variables).get("data") or {}
+        except (ValueError, requests.RequestException):
+            return {}
+        found = {}
+        for i, instance_id in enumerate(instance_ids):
+            pod = data.get(f"p{i}")
+            if pod:
+                found[instance_id] = self._parse_instance(pod)
+        return found
@@ -6,7 +6,7 @@ import os
 import requests
 from typing import Optional
 
-from .base import BaseProvider
+from .base import BaseProvider, OutOfCapacity, idempotency_headers, json_dumps, json_loads
 from ..types import Instance, GPUType, ProviderInfo, PricingTier, InstanceStatus
 
 
@@ -15,61 +15,66 @@ class VastAIProvider(BaseProvider):
 
     API_BASE = "https://console.vast.ai/api/v0"
 
+    # Static catalog info, built once at class creation rather than per access
+    _INFO = ProviderInfo(
+        name="Vast.ai",
+        api_base_url=API_BASE,
+        pricing=[
+            # Prices are approximate market rates, actual prices vary
+            PricingTier(gpu_type=GPUType.A100_80GB, hourly_cost=1.50, spot_cost=0.70, vcpus=16, ram_gb=128, storage_gb=100),
+            PricingTier(gpu_type=GPUType.A100_40GB, hourly_cost=1.20, spot_cost=0.55, vcpus=16, ram_gb=128, storage_gb=100),
+            PricingTier(gpu_type=GPUType.RTX_4090, hourly_cost=0.45, spot_cost=0.25, vcpus=16, ram_gb=64, storage_gb=100),
+            PricingTier(gpu_type=GPUType.RTX_3090, hourly_cost=0.25, spot_cost=0.12, vcpus=16, ram_gb=64, storage_gb=100),
+        ],
+        reliability_score=75.0,
+        regions=["US", "EU", "ASIA"],
+        supports_spot=True,
+        min_billing_increment=60,
+        notes="Cheapest option, marketplace model. Variable reliability depending on host.",
+    )
+
     def _get_api_key_from_env(self) -> Optional[str]:
         return os.environ.get("VASTAI_API_KEY")
 
     @property
     def info(self) -> ProviderInfo:
-        return ProviderInfo(
-            name="Vast.ai",
-            api_base_url=self.API_BASE,
-            pricing=[
-                # Prices are approximate market rates, actual prices vary
-                PricingTier(gpu_type=GPUType.A100_80GB, hourly_cost=1.50, spot_cost=0.70, vcpus=16, ram_gb=128, storage_gb=100),
-                PricingTier(gpu_type=GPUType.A100_40GB, hourly_cost=1.20, spot_cost=0.55, vcpus=16, ram_gb=128, storage_gb=100),
-                PricingTier(gpu_type=GPUType.RTX_4090, hourly_cost=0.45, spot_cost=0.25, vcpus=16, ram_gb=64, storage_gb=100),
-                PricingTier(gpu_type=GPUType.RTX_3090, hourly_cost=0.25, spot_cost=0.12, vcpus=16, ram_gb=64, storage_gb=100),
-            ],
-            reliability_score=75.0,
-            regions=["US", "EU", "ASIA"],
-            supports_spot=True,
-            min_billing_increment=60,
-            notes="Cheapest option, marketplace model. Variable reliability depending on host.",
-        )
+        return self._INFO
 
     def _headers(self) -> dict:
         return {"Authorization": f"Bearer {self.api_key}"}
 
+    # First entry whose substrings all appear in the lowercased GPU name wins
+    _GPU_SUBSTR = (
+        (("a100", "80"), GPUType.A100_80GB),
+        (("a100",), GPUType.A100_40GB),
+        (("h100",), GPUType.H100),
+        (("4090",), GPUType.RTX_4090),
+        (("3090",), GPUType.RTX_3090),
+    )
+
+    _STATUS_MAP = {
+        "running": InstanceStatus.RUNNING,
+        "loading": InstanceStatus.PENDING,
+        "exited": InstanceStatus.STOPPED,
+    }
+
     def _gpu_name_to_type(self, gpu_name: str) -> GPUType:
         gpu_name = gpu_name.lower()
-        if "a100" in gpu_name and "80" in gpu_name:
-            return GPUType.A100_80GB
-        elif "a100" in gpu_name:
-            return GPUType.A100_40GB
-        elif "h100" in gpu_name:
-            return GPUType.H100
-        elif "4090" in gpu_name:
-            return GPUType.RTX_4090
-        elif "3090" in gpu_name:
-            return GPUType.RTX_3090
-        return GPUType.A100_40GB
+        return next(
+            (g for subs, g in self._GPU_SUBSTR if all(sub in gpu_name for sub in subs)),
+            GPUType.A100_40GB,
+        )
 
     def _parse_instance(self, data: dict) -> Instance:
         gpu_name = data.get("gpu_name", "")
         gpu_type = self._gpu_name_to_type(gpu_name)
 
-        status_map = {
-            "running": InstanceStatus.RUNNING,
-            "loading": InstanceStatus.PENDING,
-            "exited": InstanceStatus.STOPPED,
-        }
-
         return Instance(
             id=str(data.get("id", "")),
             provider="vastai",
             gpu_type=gpu_type,
             gpu_count=data.get("num_gpus", 1),
-            status=status_map.get(data.get("actual_status", ""), InstanceStatus.RUNNING),
+            status=self._STATUS_MAP.get(data.get("actual_status", ""), InstanceStatus.RUNNING),
             ip_address=data.get("public_ipaddr"),
             ssh_port=data.get("ssh_port", 22),
             ssh_user="root",
@@ -81,53 +86,69 @@ class VastAIProvider(BaseProvider):
         if not self.api_key:
             return []
         try:
-            resp = requests.get(f"{self.API_BASE}/instances", headers=self._headers())
-            resp.raise_for_status()
-            instances = resp.json().get("instances", [])
+            instances = self._get_json(f"{self.API_BASE}/instances").get("instances", [])
             return [self._parse_instance(inst) for inst in instances]
         except requests.RequestException:
             return []
 
+    # Marketplace gpu_name values; the API matches the names with spaces
+    _OFFER_GPU_NAMES = {
+        GPUType.A100_80GB: "A100 SXM4",
+        GPUType.A100_40GB: "A100 PCIE",
+        GPUType.H100: "H100",
+        GPUType.RTX_4090: "RTX 4090",
+        GPUType.RTX_3090: "RTX 3090",
+    }
+
     def search_offers(
         self,
         gpu_type: GPUType,
         min_gpu_count: int = 1,
         max_price: Optional[float] = None,
         verified_only: bool = True,
+        limit: Optional[int] = None,
     ) -> list[dict]:
-        """Search for available GPU offers on the marketplace."""
+        """Search for available GPU offers on the marketplace, cheapest first.
+
+        Filtering, ordering and `limit` are all applied server-side.
+        """
         if not self.api_key:
             return []
 
-        gpu_name_map = {
-            GPUType.A100_80GB: "A100_SXM4",
-            GPUType.A100_40GB: "A100_PCIE",
-            GPUType.H100: "H100",
-            GPUType.RTX_4090: "RTX_4090",
-            GPUType.RTX_3090: "RTX_3090",
-        }
-
         query = {
-            "gpu_name": gpu_name_map.get(gpu_type, "A100"),
+            "gpu_name": {"eq": self._OFFER_GPU_NAMES.get(gpu_type, "A100")},
             "num_gpus": {"gte": min_gpu_count},
-            "rentable": True,
+            "rentable": {"eq": True},
             "verified": {"eq": verified_only},
             "order": [["dph_total", "asc"]],
         }
         if max_price:
             query["dph_total"] = {"lte": max_price}
+        if limit:
+            query["limit"] = limit
 
         try:
-            resp = requests.get(
+            resp = self._request(
+                "GET",
                 f"{self.API_BASE}/bundles",
-                headers=self._headers(),
-                params={"q": str(query)},
+                params={"q": json_dumps(query).decode()},
             )
             resp.raise_for_status()
-            return resp.json().get("offers", [])
+            return json_loads(resp.content).get("offers", [])
         except requests.RequestException:
             return []
 
+    def best_offer(
+        self,
+        gpu_type: GPUType,
+        min_gpu_count: int = 1,
+        max_price: Optional[float] = None,
+        verified_only: bool = True,
+    ) -> Optional[dict]:
+        """Return the cheapest matching offer, or None if nothing is available."""
+        offers = self.search_offers(gpu_type, min_gpu_count, max_price, verified_only, limit=1)
+        return offers[0] if offers else None
+
     def create_instance(
         self,
         gpu_type: GPUType,
@@ -136,16 +157,17 @@ class VastAIProvider(BaseProvider):
         ssh_key_name: Optional[str] = None,
         name: Optional[str] = None,
         offer_id: Optional[int] = None,
+        idempotency_key: Optional[str] = None,
     ) -> Instance:
         if not self.api_key:
             raise ValueError("API key required")
 
         # If no offer_id specified, find the cheapest one
         if not offer_id:
-            offers = self.search_offers(gpu_type, min_gpu_count=gpu_count)
-            if not offers:
-                raise RuntimeError(f"No available offers for {gpu_type.value}")
-            offer_id = offers[0]["id"]
+            offer = self.best_offer(gpu_type, min_gpu_count=gpu_count)
+            if not offer:
+                raise OutOfCapacity(f"No available offers for {gpu_type.value}")
+            offer_id = offer["id"]
 
         payload = {
             "client_id": "me",
@@ -154,13 +176,15 @@ class VastAIProvider(BaseProvider):
             "onstart": "#!/bin/bash\necho 'Instance started'",
         }
 
-        resp = requests.put(
+        resp = self._request(
+            "PUT",
             f"{self.API_BASE}/asks/{offer_id}/",
-            headers=self._headers(),
+            creates=True,
             json=payload,
+            headers=idempotency_headers(idempotency_key),
         )
         resp.raise_for_status()
-        result = resp.json()
+        result = json_loads(resp.content)
 
         if not result.get("success"):
             raise RuntimeError(f"Failed to create instance: {result}")
@@ -178,9 +202,9 @@ class VastAIProvider(BaseProvider):
         if not self.api_key:
             return False
         try:
-            resp = requests.delete(
+            resp = self._request(
+                "DELETE",
                 f"{self.API_BASE}/instances/{instance_id}/",
-                headers=self._headers(),
             )
             return resp.status_code == 200
         except requests.RequestException:
@@ -190,12 +214,12 @@ class VastAIProvider(BaseProvider):
         if not self.api_key:
             return None
         try:
-            resp = requests.get(
+            resp = self._request(
+                "GET",
                 f"{self.API_BASE}/instances/{instance_id}",
-                headers=self._headers(),
             )
             if resp.status_code == 200:
-                return self._parse_instance(resp.json())
+                return self._parse_instance(json_loads(resp.content))
         except requests.RequestException:
             pass
         return None
@@ -10,12 +10,33 @@ and updates the pricing README with the latest information.
 """
 
 import argparse
+import functools
+import hashlib
 import json
 import os
+import pickle
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from statistics import median_high
+from typing import Any, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
@@ -25,6 +46,7 @@ from ags.gpu_infra.providers.lambda_labs import LambdaLabsProvider
 from ags.gpu_infra.providers.runpod import RunPodProvider
 from ags.gpu_infra.providers.vastai import VastAIProvider
 from ags.gpu_infra.providers.coreweave import CoreWeaveProvider
+from ags.gpu_infra.providers.base import json_loads, run_in_daemon
 
 
 # Known GPU specs (VRAM, TFLOPs FP16, etc.)
@@ -39,53 +61,236 @@ GPU_SPECS = {
     GPUType.L40S: {"vram_gb": 48, "fp16_tflops": 362, "memory_bandwidth_gbps": 864, "tdp_watts": 350},
 }
 
+# README section order and headings for the per-GPU pricing tables
+GPU_TYPE_DISPLAY = {
+    "h100": "H100",
+    "a100_80gb": "A100 80GB",
+    "a100_40gb": "A100 40GB",
+    "l40s": "L40S",
+    "a10": "A10",
+    "rtx_4090": "RTX 4090",
+    "rtx_3090": "RTX 3090",
+    "v100": "V100",
+}
+
+# Upper bound on concurrent provider lookups / live API calls
+MAX_WORKERS = 8
+
+# Vast.ai search endpoint and its per-GPU offer queries, serialized once
+_VASTAI_URL = "https://console.vast.ai/api/v0/bundles"
+_VASTAI_QUERIES = {
+    gpu: {"q": json.dumps({"gpu_name": {"eq": gpu}})}
+    for gpu in ("A100", "H100", "RTX 4090", "L40S", "RTX 3090")
+}
 
+# Seconds to wait for live pricing once provider info is assembled
+LIVE_FETCH_TIMEOUT = 15
+
+# Shared session so the live API calls reuse pooled connections and retry
+# transient gateway errors with backoff
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504)),
+))
+# urllib3 lists exactly the codings it can decode: gzip/deflate, plus br and
+# zstd when the brotli / zstandard packages are installed
+_SESSION.headers["Accept-Encoding"] = ACCEPT_ENCODING
+
+PRICING_CACHE_DIR = Path.home() / ".cache" / "gpu-infra" / "pricing"
+PRICING_CACHE_TTL = 3600  # seconds; upstream pricing changes hourly at most
+
+
+def disk_ttl_cache(ttl: float = PRICING_CACHE_TTL, path: Path = PRICING_CACHE_DIR):
+    """Cache a function's non-None results on disk for `ttl` seconds.
+
+    Entries are pickled as (timestamp, value), one file per function and
+    arguments, and guarded with flock so concurrent runs don't interleave.
+    Set GPU_INFRA_NO_CACHE=1 to bypass the cache.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if os.environ.get("GPU_INFRA_NO_CACHE") == "1":
+                return func(*args, **kwargs)
+
+            digest = hashlib.sha1(repr((args, sorted(kwargs.items()))).encode()).hexdigest()[:16]
+            cache_file = Path(path).expanduser() / f"{func.__name__}-{digest}.pkl"
+            try:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                f = open(cache_file, "a+b")
+            except OSError:
+                return func(*args, **kwargs)
+
+            with f:
+                # Hold the lock across the fetch so parallel runs wait for
+                # one upstream call instead of all issuing their own
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    ts, value = pickle.load(f)
+                    if time.time() - ts < ttl:
+                        return value
+                except Exception:
+                    pass
+
+                value = func(*args, **kwargs)
+                if value is not None:
+                    f.seek(0)
+                    f.truncate()
+                    pickle.dump((time.time(), value), f)
+                return value
+
+        return wrapper
+    return decorator
+
+
+def _conditional_get(url: str, **kwargs) -> Optional[Any]:
+    """GET a JSON document, revalidating the last copy with ETag / Last-Modified.
+
+    The previous body and its validators are kept on disk, so once the TTL
+    cache expires an unchanged document costs a 304 instead of a download.
+    Returns None on a non-200/304 response.
+    """
+    use_cache = os.environ.get("GPU_INFRA_NO_CACHE") != "1"
+    key = hashlib.sha1(repr((url, sorted(kwargs.items()))).encode()).hexdigest()[:16]
+    cache_file = PRICING_CACHE_DIR / f"validators-{key}.pkl"
+
+    validators, body = {}, None
+    if use_cache:
+        try:
+            validators, body = pickle.loads(cache_file.read_bytes())
+        except Exception:
+            pass
+
+    headers = {}
+    if body is not None:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+    resp = _SESSION.get(url, headers=headers, timeout=10, **kwargs)
+    if resp.status_code == 304 and body is not None:
+        return body
+    if resp.status_code != 200:
+        return None
+
+    body = json_loads(resp.content)
+    validators = {
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+    }
+    if use_cache and any(validators.values()):
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(pickle.dumps((validators, body)))
+            tmp_path.replace(cache_file)
+        except OSError:
+            pass
+    return body
+
+
+@disk_ttl_cache()
 def fetch_lambda_pricing() -> Optional[dict]:
     """Fetch current pricing from Lambda Labs API."""
     try:
-        import requests
-        resp = requests.get("https://cloud.lambdalabs.com/api/v1/instance-types", timeout=10)
-        if resp.status_code == 200:
-            return resp.json()
+        return _conditional_get("https://cloud.lambdalabs.com/api/v1/instance-types")
     except Exception as e:
         print(f"  Warning: Could not fetch Lambda Labs pricing: {e}")
     return None
 
 
+@disk_ttl_cache()
 def fetch_runpod_pricing() -> Optional[dict]:
     """Fetch current pricing from RunPod API."""
     try:
-        import requests
         # RunPod has a public GPU types endpoint
-        resp = requests.get("https://api.runpod.io/graphql",
-                          json={"query": "{ gpuTypes { id displayName memoryInGb secureCloud communityCloud } }"},
-                          timeout=10)
-        if resp.status_code == 200:
-            return resp.json()
+        return _conditional_get("https://api.runpod.io/graphql",
+                                json={"query": "{ gpuTypes { id displayName memoryInGb secureCloud communityCloud } }"})
     except Exception as e:
         print(f"  Warning: Could not fetch RunPod pricing: {e}")
     return None
 
 
-def fetch_vastai_pricing() -> Optional[dict]:
-    """Fetch current pricing from Vast.ai API."""
+def _fetch_vastai_offers(gpu_name: str) -> Optional[list]:
     try:
-        import requests
-        # Vast.ai search endpoint for current offers
-        resp = requests.get("https://console.vast.ai/api/v0/bundles",
-                          params={"q": json.dumps({"gpu_name": {"eq": "A100"}})},
-                          timeout=10)
-        if resp.status_code == 200:
-            return resp.json()
+        result = _conditional_get(_VASTAI_URL, params=_VASTAI_QUERIES[gpu_name])
+        if result is not None:
+            return result.get("offers", [])
     except Exception as e:
-        print(f"  Warning: Could not fetch Vast.ai pricing: {e}")
+        print(f"  Warning: Could not fetch Vast.ai {gpu_name} pricing: {e}")
     return None
 
 
+@disk_ttl_cache()
+def fetch_vastai_pricing() -> Optional[dict]:
+    """Fetch current offers from Vast.ai API, keyed by GPU name."""
+    with ThreadPoolExecutor(max_workers=len(_VASTAI_QUERIES)) as executor:
+        results = executor.map(_fetch_vastai_offers, _VASTAI_QUERIES)
+        offers = {
+            name: result
+            for name, result in zip(_VASTAI_QUERIES, results)
+            if result is not None
+        }
+    # Report total failure as None so it isn't cached
+    return offers or None
+
+
+def _summarize_vastai_offers(offers: list) -> dict:
+    """Reduce raw Vast.ai offers to a count and upper-median prices.
+
+    Uses the same price filters as live_pricing._parse_vast, and keeps
+    per-host fields out of the pricing data file.
+    """
+    prices = [o["dph_total"] for o in offers if o.get("dph_total")]
+    bids = [o["min_bid"] for o in offers if o.get("min_bid") and o["min_bid"] > 0]
+    return {
+        "offers": len(offers),
+        "median_dph_total": round(median_high(prices), 2) if prices else None,
+        "median_min_bid": round(median_high(bids), 2) if bids else None,
+    }
+
+
+def _provider_entry(provider) -> dict:
+    """Serialize a provider's static info for the pricing data file."""
+    info = provider.info
+    return {
+        "name": info.name,
+        "reliability_score": info.reliability_score,
+        "supports_spot": info.supports_spot,
+        "regions": info.regions,
+        "min_billing_increment": info.min_billing_increment,
+        "notes": info.notes,
+        "pricing": [
+            {
+                "gpu_type": tier.gpu_type.value,
+                "hourly_cost": tier.hourly_cost,
+                "spot_cost": tier.spot_cost,
+                "vcpus": tier.vcpus,
+                "ram_gb": tier.ram_gb,
+                "storage_gb": tier.storage_gb,
+            }
+            for tier in info.pricing
+        ],
+    }
+
+
 def get_all_pricing_data() -> dict:
     """Collect pricing from all providers."""
     print("Fetching pricing data...")
 
+    # Start the network-bound live fetch first so provider construction and
+    # info assembly overlap with it instead of preceding it. Daemon threads,
+    # so a fetch that times out below can't hold up interpreter exit.
+    live_futures = {
+        "lambda": run_in_daemon(fetch_lambda_pricing),
+        "vastai": run_in_daemon(fetch_vastai_pricing),
+    }
+
     providers = {
         "lambda": LambdaLabsProvider(),
         "runpod": RunPodProvider(),
@@ -99,34 +304,39 @@ def get_all_pricing_data() -> dict:
         "gpu_specs": {k.value: v for k, v in GPU_SPECS.items()},
     }
 
-    for name, provider in providers.items():
-        print(f"  Processing {name}...")
-        info = provider.info
-        data["providers"][name] = {
-            "name": info.name,
-            "reliability_score": info.reliability_score,
-            "supports_spot": info.supports_spot,
-            "regions": info.regions,
-            "min_billing_increment": info.min_billing_increment,
-            "notes": info.notes,
-            "pricing": [
-                {
-                    "gpu_type": tier.gpu_type.value,
-                    "hourly_cost": tier.hourly_cost,
-                    "spot_cost": tier.spot_cost,
-                    "vcpus": tier.vcpus,
-                    "ram_gb": tier.ram_gb,
-                    "storage_gb": tier.storage_gb,
-                }
-                for tier in info.pricing
-            ],
+    print("  Fetching provider info and live pricing from APIs...")
+    entries = {}
+    live = {}
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {executor.submit(_provider_entry, p): name for name, p in providers.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                entries[name] = future.result()
+                print(f"  Processed {name}")
+            except Exception as e:
+                print(f"  Warning: Could not process {name}: {e}")
+    deadline = time.monotonic() + LIVE_FETCH_TIMEOUT
+    for name, future in live_futures.items():
+        try:
+            live[name] = future.result(timeout=max(0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            print(f"  Warning: Timed out fetching live {name} pricing")
+
+    # Keep the provider order stable regardless of completion order
+    for name in providers:
+        if name in entries:
+            data["providers"][name] = entries[name]
+
+    live_pricing = {}
+    if live.get("lambda") and "data" in live["lambda"]:
+        live_pricing["lambda"] = live["lambda"]["data"]
+    if live.get("vastai"):
+        live_pricing["vastai"] = {
+            gpu: _summarize_vastai_offers(offers) for gpu, offers in live["vastai"].items()
         }
-
-    # Try to fetch live pricing
-    print("  Fetching live pricing from APIs...")
-    live_lambda = fetch_lambda_pricing()
-    if live_lambda and "data" in live_lambda:
-        data["live_pricing"] = {"lambda": live_lambda["data"]}
+    if live_pricing:
+        data["live_pricing"] = live_pricing
 
     return data
 
@@ -136,6 +346,13 @@ def generate_readme(data: dict) -> str:
 
     updated = data.get("updated_at", "Unknown")
 
+    # provider -> gpu_type -> first matching tier, built once up front
+    index = {}
+    for pname, pdata in data["providers"].items():
+        tiers = index[pname] = {}
+        for tier in pdata["pricing"]:
+            tiers.setdefault(tier["gpu_type"], tier)
+
     lines = [
         "# GPU Cloud Infrastructure Pricing Guide",
         "",
@@ -153,10 +370,9 @@ def generate_readme(data: dict) -> str:
     # Sort by on-demand price for A100
     provider_a100_prices = []
     for pname, pdata in data["providers"].items():
-        for tier in pdata["pricing"]:
-            if tier["gpu_type"] == "a100_40gb":
-                provider_a100_prices.append((pname, pdata, tier))
-                break
+        tier = index[pname].get("a100_40gb")
+        if tier is not None:
+            provider_a100_prices.append((pname, pdata, tier))
 
     provider_a100_prices.sort(key=lambda x: x[2]["hourly_cost"])
 
@@ -175,13 +391,13 @@ def generate_readme(data: dict) -> str:
     ])
 
     # Group by GPU type
-    gpu_types = ["h100", "a100_80gb", "a100_40gb", "l40s", "a10", "rtx_4090", "rtx_3090", "v100"]
+    sorted_providers = sorted(data["providers"].items())
 
-    for gpu_type in gpu_types:
+    for gpu_type, display_name in GPU_TYPE_DISPLAY.items():
         gpu_spec = data["gpu_specs"].get(gpu_type, {})
 
         lines.extend([
-            f"### {gpu_type.upper().replace('_', ' ')}",
+            f"### {display_name}",
             "",
         ])
 
@@ -198,16 +414,16 @@ def generate_readme(data: dict) -> str:
         lines.append("|----------|----------------|-----------|-------|-----|---------|")
 
         has_pricing = False
-        for pname, pdata in sorted(data["providers"].items()):
-            for tier in pdata["pricing"]:
-                if tier["gpu_type"] == gpu_type:
-                    has_pricing = True
-                    spot = f"${tier['spot_cost']:.2f}" if tier.get("spot_cost") else "N/A"
-                    lines.append(
-                        f"| {pdata['name']} | ${tier['hourly_cost']:.2f} | {spot} | "
-                        f"{tier['vcpus']} | {tier['ram_gb']}GB | {tier['storage_gb']}GB |"
-                    )
-                    break
+        for pname, pdata in sorted_providers:
+            tier = index[pname].get(gpu_type)
+            if tier is None:
+                continue
+            has_pricing = True
+            spot = f"${tier['spot_cost']:.2f}" if tier.get("spot_cost") else "N/A"
+            lines.append(
+                f"| {pdata['name']} | ${tier['hourly_cost']:.2f} | {spot} | "
+                f"{tier['vcpus']} | {tier['ram_gb']}GB | {tier['storage_gb']}GB |"
+            )
 
         if not has_pricing:
             lines.append("| *No providers currently offer this GPU* | - | - | - | - | - |")
@@ -265,8 +481,14 @@ def generate_readme(data: dict) -> str:
 
 def save_pricing_json(data: dict, path: Path):
     """Save raw pricing data as JSON for programmatic access."""
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
+    # Serialize in memory and write once rather than streaming small writes
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2).encode()
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(payload)
     print(f"Saved pricing data to {path}")
 
 
@@ -283,19 +505,24 @@ def main():
     # Get pricing data
     data = get_all_pricing_data()
 
-    # Generate and save README
-    readme = generate_readme(data)
-    output_path = Path(args.output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # The README and JSON outputs only read `data`, so write them side by side
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        json_future = None
+        if not args.no_json:
+            json_future = executor.submit(save_pricing_json, data, Path(args.json))
+
+        # Generate and save README
+        readme = generate_readme(data)
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, "w") as f:
-        f.write(readme)
-    print(f"Saved pricing README to {output_path}")
+        with open(output_path, "w") as f:
+            f.write(readme)
 
-    # Save JSON data
-    if not args.no_json:
-        json_path = Path(args.json)
-        save_pricing_json(data, json_path)
+        # Wait before reporting so the two "Saved ..." lines don't interleave
+        if json_future is not None:
+            json_future.result()
+        print(f"Saved pricing README to {output_path}")
 
     print("\nDone!")
 
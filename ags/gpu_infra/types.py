@@ -4,8 +4,15 @@ Type definitions for GPU infrastructure management.
 
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from typing import Optional
 from datetime import datetime
+import sys
+
+
+# Slotted dataclasses drop the per-instance __dict__. Only enabled on 3.11+,
+# where frozen slotted dataclasses pickle and unpickle correctly.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 11) else {}
 
 
 class GPUType(Enum):
@@ -30,7 +37,7 @@ class InstanceStatus(Enum):
     ERROR = "error"
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class PricingTier:
     """Pricing information for a GPU instance type."""
     gpu_type: GPUType
@@ -42,7 +49,7 @@ class PricingTier:
     spot_cost: Optional[float] = None  # Spot/preemptible price if available
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class ProviderInfo:
     """Information about a GPU cloud provider."""
     name: str
@@ -55,7 +62,7 @@ class ProviderInfo:
     notes: str = ""
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Instance:
     """Represents a GPU instance."""
     id: str
@@ -76,9 +83,15 @@ class Instance:
         """Generate SSH command for this instance."""
         if not self.ip_address:
             raise ValueError("Instance has no IP address")
+        return _ssh_command(self.ssh_port, self.ssh_key_path, self.ssh_user, self.ip_address)
+
 
-        cmd = f"ssh -p {self.ssh_port}"
-        if self.ssh_key_path:
-            cmd += f" -i {self.ssh_key_path}"
-        cmd += f" {self.ssh_user}@{self.ip_address}"
-        return cmd
+# Keyed on the connection fields themselves, so mutating an Instance never
+# serves a stale command and no per-instance invalidation is needed
+@lru_cache(maxsize=256)
+def _ssh_command(port: int, key_path: Optional[str], user: str, ip_address: str) -> str:
+    cmd = f"ssh -p {port}"
+    if key_path:
+        cmd += f" -i {key_path}"
+    cmd += f" {user}@{ip_address}"
+    return cmd
@@ -1,24 +1,98 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
 from ags.lib.oai import get_oai_client
 
-def generate_oai_embeddings(texts: list[str], model: str = "text-embedding-3-small") -> list[list[float]]:
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Per-request input token limit for OpenAI embedding models
+MAX_TOKENS_PER_REQUEST = 8191
+
+
+def _count_tokens(texts: list[str], model: str) -> int:
+    """Count tokens in texts, estimating ~4 chars/token without tiktoken."""
+    if tiktoken is None:
+        return sum(len(text) // 4 + 1 for text in texts)
+    try:
+        encoding = tiktoken.encoding_for_model(model)
+    except KeyError:
+        encoding = tiktoken.get_encoding("cl100k_base")
+    return sum(len(encoding.encode(text)) for text in texts)
+
+
+def _split_batches(texts: list[str], batch_size: int, model: str) -> list[list[str]]:
+    """Split texts into batches of at most batch_size that fit the token limit."""
+    pending = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    batches = []
+    while pending:
+        chunk = pending.pop(0)
+        if len(chunk) > 1 and _count_tokens(chunk, model) > MAX_TOKENS_PER_REQUEST:
+            mid = len(chunk) // 2
+            pending[:0] = [chunk[:mid], chunk[mid:]]
+        else:
+            batches.append(chunk)
+    return batches
+
+
+def _embed_batch(texts: list[str], model: str) -> list[list[float]]:
+    response = get_oai_client().embeddings.create(
+        input=texts,
+        model=model
+    )
+    return [item.embedding for item in response.data]
+
+
+def generate_oai_embeddings(
+    texts: list[str],
+    model: str = "text-embedding-3-small",
+    batch_size: int = 100,
+    max_concurrency: int = 8,
+) -> list[list[float]]:
     """Generate embeddings for a batch of texts.
-    
+
     Args:
         texts: List of texts to generate embeddings for
         model: Model to use for embeddings
-        
+        batch_size: Maximum number of texts sent per request
+        max_concurrency: Maximum number of requests in flight
+
     Returns:
         List of embeddings, one for each input text
     """
     if not texts:
         return []
-        
-    response = get_oai_client().embeddings.create(
-        input=texts,
-        model=model
-    )
-    
-    return [item.embedding for item in response.data]
+
+    batches = _split_batches(list(texts), batch_size, model)
+    if len(batches) == 1:
+        return _embed_batch(batches[0], model)
+
+    # Executor.map yields results in submission order, preserving input order
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, len(batches))) as executor:
+        results = executor.map(lambda batch: _embed_batch(batch, model), batches)
+        return [embedding for batch in results for embedding in batch]
+
+
+@lru_cache(maxsize=8192)
+def _embed_single_cached(text: str, model: str) -> tuple[float, ...]:
+    return tuple(generate_oai_embeddings([text], model=model)[0])
+
+
+def generate_oai_embedding(text: str, model: str = "text-embedding-3-small") -> list[float]:
+    """Generate the embedding for a single text.
+
+    Repeated identical texts are served from an in-process cache.
+
+    Args:
+        text: Text to generate an embedding for
+        model: Model to use for embeddings
+
+    Returns:
+        The embedding for the text
+    """
+    return list(_embed_single_cached(text, model))
 
 def test():
     print("hi")
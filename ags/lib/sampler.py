@@ -18,15 +18,25 @@ Usage:
         messages=[{"role": "user", "content": "Hello!"}],
     )
     print(response.text)
+
+    # Async, for fanning out many requests on one event loop
+    sampler = Sampler.create_async(provider="claude")
+    responses = await sampler.chat_many(
+        [[{"role": "user", "content": q}] for q in questions],
+        max_concurrency=20,
+    )
 """
 
+import asyncio
 import os
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any, Generator
 
-from openai import OpenAI
-from anthropic import Anthropic
+import httpx
+from openai import AsyncOpenAI, OpenAI
+from anthropic import Anthropic, AsyncAnthropic
 
 
 PROVIDERS = {"OPENAI": "openai", "CLAUDE": "claude"}
@@ -37,6 +47,34 @@ DEFAULT_MODELS = {
 }
 
 
+CLIENT_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+CLIENT_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+
+# Default cap on in-flight requests for AsyncBaseSampler.chat_many
+DEFAULT_MAX_CONCURRENCY = 40
+
+
+# Clients are shared per api_key so concurrent samplers reuse one connection pool
+@lru_cache(maxsize=8)
+def _openai_client(api_key: str | None) -> OpenAI:
+    return OpenAI(
+        api_key=api_key,
+        max_retries=2,
+        timeout=CLIENT_TIMEOUT,
+        http_client=httpx.Client(limits=CLIENT_LIMITS, timeout=CLIENT_TIMEOUT),
+    )
+
+
+@lru_cache(maxsize=8)
+def _anthropic_client(api_key: str | None) -> Anthropic:
+    return Anthropic(
+        api_key=api_key,
+        max_retries=2,
+        timeout=CLIENT_TIMEOUT,
+        http_client=httpx.Client(limits=CLIENT_LIMITS, timeout=CLIENT_TIMEOUT),
+    )
+
+
 @dataclass
 class SamplerResponse:
     text: str
@@ -73,6 +111,61 @@ class BaseSampler(ABC):
         ...
 
 
+def _openai_kwargs(sampler, messages, system_prompt, max_tokens, temperature) -> dict:
+    formatted = []
+    if system_prompt:
+        formatted.append({"role": "system", "content": system_prompt})
+    formatted.extend(messages)
+
+    kwargs = {
+        "model": sampler.model,
+        "max_tokens": max_tokens or sampler.max_tokens,
+        "messages": formatted,
+    }
+    if temperature is not None:
+        kwargs["temperature"] = temperature
+    return kwargs
+
+
+def _openai_response(response) -> SamplerResponse:
+    return SamplerResponse(
+        text=response.choices[0].message.content,
+        model=response.model,
+        input_tokens=getattr(response.usage, "prompt_tokens", None),
+        output_tokens=getattr(response.usage, "completion_tokens", None),
+        stop_reason=response.choices[0].finish_reason,
+        raw=response,
+    )
+
+
+def _claude_kwargs(sampler, messages, system_prompt, max_tokens, temperature) -> dict:
+    kwargs = {
+        "model": sampler.model,
+        "max_tokens": max_tokens or sampler.max_tokens,
+        "messages": messages,
+    }
+    if system_prompt:
+        kwargs["system"] = system_prompt
+    if temperature is not None:
+        kwargs["temperature"] = temperature
+    return kwargs
+
+
+def _claude_response(response) -> SamplerResponse:
+    text = "".join(
+        block.text for block in response.content if block.type == "text"
+    )
+
+    return SamplerResponse(
+        text=text,
+        model=response.model,
+        input_tokens=getattr(response.usage, "input_tokens", None),
+        output_tokens=getattr(response.usage, "output_tokens", None),
+        stop_reason=response.stop_reason,
+        raw=response,
+    )
+
+
 class OpenAISampler(BaseSampler):
     def __init__(
         self,
@@ -81,54 +174,25 @@ class OpenAISampler(BaseSampler):
         max_tokens: int = 1024,
     ):
         super().__init__(model=model or DEFAULT_MODELS["openai"], max_tokens=max_tokens)
-        self.client = OpenAI(api_key=api_key or os.environ.get("OPENAI_API_KEY"))
+        self.client = _openai_client(api_key or os.environ.get("OPENAI_API_KEY"))
 
     def chat(self, messages, system_prompt=None, max_tokens=None, temperature=None):
-        formatted = []
-        if system_prompt:
-            formatted.append({"role": "system", "content": system_prompt})
-        formatted.extend(messages)
-
-        kwargs = {
-            "model": self.model,
-            "max_tokens": max_tokens or self.max_tokens,
-            "messages": formatted,
-        }
-        if temperature is not None:
-            kwargs["temperature"] = temperature
-
-        response = self.client.chat.completions.create(**kwargs)
-
-        return SamplerResponse(
-            text=response.choices[0].message.content,
-            model=response.model,
-            input_tokens=getattr(response.usage, "prompt_tokens", None),
-            output_tokens=getattr(response.usage, "completion_tokens", None),
-            stop_reason=response.choices[0].finish_reason,
-            raw=response,
-        )
+        kwargs = _openai_kwargs(self, messages, system_prompt, max_tokens, temperature)
+        return _openai_response(self.client.chat.completions.create(**kwargs))
 
     def chat_stream(self, messages, system_prompt=None, max_tokens=None, temperature=None):
-        formatted = []
-        if system_prompt:
-            formatted.append({"role": "system", "content": system_prompt})
-        formatted.extend(messages)
-
-        kwargs = {
-            "model": self.model,
-            "max_tokens": max_tokens or self.max_tokens,
-            "messages": formatted,
-            "stream": True,
-        }
-        if temperature is not None:
-            kwargs["temperature"] = temperature
+        kwargs = _openai_kwargs(self, messages, system_prompt, max_tokens, temperature)
+        kwargs["stream"] = True
 
         stream = self.client.chat.completions.create(**kwargs)
 
         for chunk in stream:
-            delta = chunk.choices[0].delta.content if chunk.choices[0].delta else None
-            if delta:
-                yield delta
+            choices = chunk.choices
+            if not choices:
+                continue
+            delta = choices[0].delta
+            if delta and (text := delta.content):
+                yield text
 
 
 class ClaudeSampler(BaseSampler):
@@ -139,53 +203,137 @@ class ClaudeSampler(BaseSampler):
         max_tokens: int = 1024,
     ):
         super().__init__(model=model or DEFAULT_MODELS["claude"], max_tokens=max_tokens)
-        self.client = Anthropic(api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"))
+        self.client = _anthropic_client(api_key or os.environ.get("ANTHROPIC_API_KEY"))
 
     def chat(self, messages, system_prompt=None, max_tokens=None, temperature=None):
-        kwargs = {
-            "model": self.model,
-            "max_tokens": max_tokens or self.max_tokens,
-            "messages": messages,
-        }
-        if system_prompt:
-            kwargs["system"] = system_prompt
-        if temperature is not None:
-            kwargs["temperature"] = temperature
-
-        response = self.client.messages.create(**kwargs)
-
-        text = "".join(
-            block.text for block in response.content if block.type == "text"
-        )
-
-        return SamplerResponse(
-            text=text,
-            model=response.model,
-            input_tokens=getattr(response.usage, "input_tokens", None),
-            output_tokens=getattr(response.usage, "output_tokens", None),
-            stop_reason=response.stop_reason,
-            raw=response,
-        )
+        kwargs = _claude_kwargs(self, messages, system_prompt, max_tokens, temperature)
+        return _claude_response(self.client.messages.create(**kwargs))
 
     def chat_stream(self, messages, system_prompt=None, max_tokens=None, temperature=None):
-        kwargs = {
-            "model": self.model,
-            "max_tokens": max_tokens or self.max_tokens,
-            "messages": messages,
-        }
-        if system_prompt:
-            kwargs["system"] = system_prompt
-        if temperature is not None:
-            kwargs["temperature"] = temperature
+        kwargs = _claude_kwargs(self, messages, system_prompt, max_tokens, temperature)
 
         with self.client.messages.stream(**kwargs) as stream:
             for text in stream.text_stream:
                 yield text
 
 
+class AsyncBaseSampler(ABC):
+    def __init__(self, model: str | None = None, max_tokens: int = 1024):
+        self.model = model
+        self.max_tokens = max_tokens
+
+    @abstractmethod
+    async def chat(
+        self,
+        messages: list[dict],
+        system_prompt: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+    ) -> SamplerResponse:
+        ...
+
+    async def chat_many(
+        self,
+        conversations: list[list[dict]],
+        system_prompt: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> list[SamplerResponse]:
+        """Run many chats concurrently, at most max_concurrency in flight.
+
+        Responses are returned in the same order as conversations.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(messages):
+            async with semaphore:
+                return await self.chat(messages, system_prompt, max_tokens, temperature)
+
+        return await asyncio.gather(*(run(messages) for messages in conversations))
+
+
+class AsyncOpenAISampler(AsyncBaseSampler):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        model: str | None = None,
+        max_tokens: int = 1024,
+    ):
+        super().__init__(model=model or DEFAULT_MODELS["openai"], max_tokens=max_tokens)
+        self.client = AsyncOpenAI(
+            api_key=api_key or os.environ.get("OPENAI_API_KEY"),
+            max_retries=2,
+            timeout=CLIENT_TIMEOUT,
+            http_client=httpx.AsyncClient(limits=CLIENT_LIMITS, timeout=CLIENT_TIMEOUT),
+        )
+
+    async def chat(self, messages, system_prompt=None, max_tokens=None, temperature=None):
+        kwargs = _openai_kwargs(self, messages, system_prompt, max_tokens, temperature)
+        return _openai_response(await self.client.chat.completions.create(**kwargs))
+
+
+class AsyncClaudeSampler(AsyncBaseSampler):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        model: str | None = None,
+        max_tokens: int = 1024,
+    ):
+        super().__init__(model=model or DEFAULT_MODELS["claude"], max_tokens=max_tokens)
+        self.client = AsyncAnthropic(
+            api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"),
+            max_retries=2,
+            timeout=CLIENT_TIMEOUT,
+            http_client=httpx.AsyncClient(limits=CLIENT_LIMITS, timeout=CLIENT_TIMEOUT),
+        )
+
+    async def chat(self, messages, system_prompt=None, max_tokens=None, temperature=None):
+        kwargs = _claude_kwargs(self, messages, system_prompt, max_tokens, temperature)
+        return _claude_response(await self.client.messages.create(**kwargs))
+
+
+# Provider name/alias -> sampler class, used by the Sampler factory
+_SAMPLER_REGISTRY: dict[str, type[BaseSampler]] = {
+    "openai": OpenAISampler,
+    "gpt": OpenAISampler,
+    "claude": ClaudeSampler,
+    "anthropic": ClaudeSampler,
+}
+
+_ASYNC_SAMPLER_REGISTRY: dict[str, type[AsyncBaseSampler]] = {
+    "openai": AsyncOpenAISampler,
+    "gpt": AsyncOpenAISampler,
+    "claude": AsyncClaudeSampler,
+    "anthropic": AsyncClaudeSampler,
+}
+
+
+def _lookup(registry: dict, provider: str | None):
+    provider = (provider or os.environ.get("LLM_PROVIDER", "openai")).lower()
+    cls = registry.get(provider)
+    if cls is None:
+        raise ValueError(f"Unknown provider: {provider}. Use one of: {', '.join(registry)}.")
+    return cls
+
+
 class Sampler:
     """Factory for creating sampler instances."""
 
+    @staticmethod
+    def register(*names: str):
+        """Class decorator registering a sampler under one or more provider names.
+
+        Subclasses of AsyncBaseSampler are registered for create_async,
+        everything else for create.
+        """
+        def decorator(cls):
+            registry = _ASYNC_SAMPLER_REGISTRY if issubclass(cls, AsyncBaseSampler) else _SAMPLER_REGISTRY
+            for name in names:
+                registry[name.lower()] = cls
+            return cls
+        return decorator
+
     @staticmethod
     def create(
         provider: str | None = None,
@@ -193,11 +341,15 @@ class Sampler:
         model: str | None = None,
         max_tokens: int = 1024,
     ) -> BaseSampler:
-        provider = (provider or os.environ.get("LLM_PROVIDER", "openai")).lower()
-
-        if provider in ("openai", "gpt"):
-            return OpenAISampler(api_key=api_key, model=model, max_tokens=max_tokens)
-        elif provider in ("claude", "anthropic"):
-            return ClaudeSampler(api_key=api_key, model=model, max_tokens=max_tokens)
-        else:
-            raise ValueError(f"Unknown provider: {provider}. Use 'openai' or 'claude'.")
+        cls = _lookup(_SAMPLER_REGISTRY, provider)
+        return cls(api_key=api_key, model=model, max_tokens=max_tokens)
+
+    @staticmethod
+    def create_async(
+        provider: str | None = None,
+        api_key: str | None = None,
+        model: str | None = None,
+        max_tokens: int = 1024,
+    ) -> AsyncBaseSampler:
+        cls = _lookup(_ASYNC_SAMPLER_REGISTRY, provider)
+        return cls(api_key=api_key, model=model, max_tokens=max_tokens)